@@ -0,0 +1,275 @@
+"""
+Headless benchmarks for the widgets in textual_extras
+
+Every exported widget is built with several data volumes, rendered into a
+captured rich Console at several sizes and fed keys, then the render time,
+the time per key and the peak memory are written out as JSON
+
+    python benchmarks/bench_widgets.py --output results.json
+    python benchmarks/bench_widgets.py --quick --compare results.json
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from importlib.metadata import version
+from typing import Awaitable, Callable
+
+from rich.console import Console
+from textual import events
+from textual.geometry import Size
+from textual.widget import Widget
+
+from textual_extras.widgets import (
+    List,
+    ListEdit,
+    MultiLineTextInput,
+    NestedListEdit,
+    Notification,
+    SearchList,
+    SimpleInput,
+    SyntaxBox,
+    TextInput,
+)
+
+ROWS = [10, 1_000, 100_000]
+VALUE_BYTES = [10, 1_000, 100_000, 1_000_000]
+SIZES = [(40, 10), (120, 50)]
+
+Factory = Callable[[int], Awaitable[Widget]]
+
+
+async def make_text_input(length: int) -> Widget:
+    widget = TextInput()
+    widget.value = ("lorem ipsum " * (length // 12 + 1))[:length]
+    widget.on_focus()
+    return widget
+
+
+async def make_list(rows: int) -> Widget:
+    return List(options=[f"option {i}" for i in range(rows)])
+
+
+async def make_search_list(rows: int) -> Widget:
+    return SearchList(options=[f"option {i}" for i in range(rows)])
+
+
+async def make_list_edit(rows: int) -> Widget:
+    return ListEdit(options=[f"option {i}" for i in range(rows)])
+
+
+async def make_multiline(rows: int) -> Widget:
+    widget = MultiLineTextInput()
+    for i in range(rows - 1):
+        widget.add_option_below()
+        widget.current_opt.value = f"line {i}"
+
+    return widget
+
+
+async def make_syntax_box(rows: int) -> Widget:
+    widget = SyntaxBox("python")
+    for i in range(rows - 1):
+        widget.add_option_below()
+        widget.current_opt.value = f"value_{i} = {i} * 2"
+
+    return widget
+
+
+async def make_nested_list(rows: int) -> Widget:
+    widget = NestedListEdit("root")
+    for i in range(rows):
+        data = SimpleInput()
+        data.value = f"node {i}"
+        await widget.root.add("child", data)
+
+    await widget.move_to_top()
+    return widget
+
+
+async def make_notification(length: int) -> Widget:
+    widget = Notification(message=("lorem ipsum " * (length // 12 + 1))[:length])
+    widget.started = True
+    return widget
+
+
+# name -> (factory, data volumes, keys to replay)
+BENCHMARKS: dict[str, tuple[Factory, list[int], list[str]]] = {
+    "TextInput": (
+        make_text_input,
+        VALUE_BYTES,
+        ["a", "left", "ctrl+left", "ctrl+h", "home", "end"],
+    ),
+    "List": (make_list, ROWS, ["j", "k", "G", "g"]),
+    "SearchList": (make_search_list, ROWS, ["ctrl+s", "1", "2", "ctrl+h", "escape"]),
+    "ListEdit": (make_list_edit, ROWS, ["j", "k", "G", "g"]),
+    "MultiLineTextInput": (make_multiline, ROWS, ["a", "left", "up", "down"]),
+    "SyntaxBox": (make_syntax_box, ROWS, ["a", "left", "up", "down"]),
+    "NestedListEdit": (make_nested_list, ROWS, ["j", "k", "G", "g"]),
+    "Notification": (make_notification, VALUE_BYTES, []),
+}
+
+
+def render(widget: Widget, width: int, height: int) -> tuple[float, int, int]:
+    """
+    Renders the widget the way textual would, returns (seconds, rows, chars)
+    """
+
+    widget._update_size(Size(width, height))
+    console = Console(
+        width=width,
+        height=height,
+        file=io.StringIO(),
+        color_system="truecolor",
+        legacy_windows=False,
+    )
+
+    start = time.perf_counter()
+    lines = console.render_lines(
+        widget.render(),
+        console.options.update_dimensions(width, height),
+    )
+    elapsed = time.perf_counter() - start
+
+    return (
+        elapsed,
+        len(lines),
+        sum(len(segment.text) for line in lines for segment in line),
+    )
+
+
+async def press_keys(widget: Widget, keys: list[str], repeat: int) -> dict[str, float]:
+    """
+    Replays the keys and returns the mean seconds taken per key
+    """
+
+    timings = {key: 0.0 for key in keys}
+    for _ in range(repeat):
+        for key in keys:
+            start = time.perf_counter()
+            await widget.on_key(events.Key(widget, key))
+            timings[key] += time.perf_counter() - start
+
+    return {key: total / repeat for key, total in timings.items()}
+
+
+async def run_case(
+    name: str, factory: Factory, volume: int, keys: list[str], repeat: int
+) -> list[dict]:
+    results = []
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    widget = await factory(volume)
+    build = time.perf_counter() - start
+    render(widget, *SIZES[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for width, height in SIZES:
+        widget = await factory(volume)
+        first, rows, chars = render(widget, width, height)
+        again, _, _ = render(widget, width, height)
+        key_times = await press_keys(widget, keys, repeat)
+        after_keys, _, _ = render(widget, width, height)
+
+        results.append(
+            {
+                "widget": name,
+                "volume": volume,
+                "size": f"{width}x{height}",
+                "build_ms": build * 1000,
+                "render_ms": first * 1000,
+                "rerender_ms": again * 1000,
+                "render_after_keys_ms": after_keys * 1000,
+                "key_ms": {key: value * 1000 for key, value in key_times.items()},
+                "rows": rows,
+                "chars": chars,
+                "peak_kb": peak / 1024,
+            }
+        )
+
+    return results
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    results = []
+    for name, (factory, volumes, keys) in BENCHMARKS.items():
+        if args.widget and name not in args.widget:
+            continue
+
+        for volume in volumes[:2] if args.quick else volumes:
+            print(f"{name} ({volume}) ...", file=sys.stderr)
+            results += await run_case(name, factory, volume, keys, args.repeat)
+
+    return results
+
+
+def compare(results: list[dict], path: str) -> None:
+    """
+    Prints how each timing changed against an earlier run
+    """
+
+    with open(path) as file:
+        old = {
+            (result["widget"], result["volume"], result["size"]): result
+            for result in json.load(file)["results"]
+        }
+
+    for result in results:
+        key = (result["widget"], result["volume"], result["size"])
+        if (before := old.get(key)) is None:
+            continue
+
+        changes = [
+            f"{metric} x{result[metric] / before[metric]:.2f}"
+            for metric in ("render_ms", "rerender_ms", "peak_kb")
+            if before[metric]
+        ]
+        changes += [
+            f"{key_name} x{value / before['key_ms'][key_name]:.2f}"
+            for key_name, value in result["key_ms"].items()
+            if before["key_ms"].get(key_name)
+        ]
+        print(f"{' '.join(map(str, key)):<40} {', '.join(changes)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against an earlier JSON file")
+    parser.add_argument("--widget", action="append", help="only run this widget")
+    parser.add_argument("--repeat", type=int, default=20, help="times to replay keys")
+    parser.add_argument(
+        "--quick", action="store_true", help="only the two smallest data volumes"
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    report = {
+        "meta": {
+            "time": time.time(),
+            "python": platform.python_version(),
+            "textual": version("textual"),
+            "rich": version("rich"),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
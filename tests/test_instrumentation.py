@@ -0,0 +1,50 @@
+import asyncio
+import io
+
+from rich.console import Console
+from textual._context import active_app
+from textual.geometry import Size
+
+from textual_extras.utils import instrumentation
+from textual_extras.widgets import NestedListEdit, SimpleInput
+
+
+class FakeApp:
+    console = Console(
+        width=40, height=10, file=io.StringIO(), color_system=None, legacy_windows=False
+    )
+
+
+async def make_tree() -> NestedListEdit:
+    tree = NestedListEdit("root")
+    for value in ("first", "second", "third"):
+        data = SimpleInput()
+        data.value = value
+        await tree.root.add("child", data)
+
+    await tree.root.expand()
+    await tree.move_to_top()
+    return tree
+
+
+def test_nested_list_edit_renders_with_instrumentation():
+    token = active_app.set(FakeApp())
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        tree = asyncio.run(make_tree())
+        tree._update_size(Size(40, 10))
+        tree.render_lines()
+        text = "".join(
+            segment.text for line in tree.render_cache.lines for segment in line
+        )
+        stats = instrumentation.snapshot()["NestedListEdit"]
+    finally:
+        instrumentation.disable()
+        active_app.reset(token)
+
+    assert "first" in text and "second" in text and "third" in text
+    assert "instrumentation" not in text
+    assert stats.renders == 1
+    assert stats.rows == 10
+    assert instrumentation.stats["SimpleInput"].renders == 0
@@ -0,0 +1,29 @@
+import asyncio
+
+from textual import events
+from textual.geometry import Size
+
+from textual_extras.widgets import TextInput
+
+
+async def type_keys(widget: TextInput, keys: list[str]) -> None:
+    for key in keys:
+        await widget.on_key(events.Key(widget, key))
+
+
+def test_pattern_allows_typing_a_valid_value_key_by_key():
+    widget = TextInput(pattern=r"\d{3}-\d{4}")
+    widget._update_size(Size(20, 3))
+    widget._set_view()
+
+    asyncio.run(type_keys(widget, list("555-12")))
+    assert widget.value == "555-12"
+    assert not widget.valid
+
+    asyncio.run(type_keys(widget, list("34")))
+    assert widget.value == "555-1234"
+    assert widget.valid
+
+    asyncio.run(type_keys(widget, ["ctrl+h"]))
+    assert widget.value == "555-123"
+    assert not widget.valid
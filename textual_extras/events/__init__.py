@@ -1,8 +1,15 @@
-from .events import TextChanged, PyperclipError, InvalidInputAttempt, ListItemSelected
+from .events import (
+    TextChanged,
+    PyperclipError,
+    InvalidInputAttempt,
+    ListItemSelected,
+    RenderStats,
+)
 
 __all__ = [
     "TextChanged",
     "PyperclipError",
     "InvalidInputAttempt",
     "ListItemSelected",
+    "RenderStats",
 ]
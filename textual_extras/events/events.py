@@ -17,9 +17,13 @@ class PyperclipError(Event):
 class InvalidInputAttempt(Event):
     """
     Emitted when a letter in blackist or a letter not in whitelist was being tried to push in the widget
+    `positions` holds the offending indexes in the attempted text, it is empty
+    when the text was refused because of the max length
     """
 
-    pass
+    def __init__(self, sender, positions: list[int] | None = None) -> None:
+        super().__init__(sender)
+        self.positions = positions or []
 
 
 class ListItemSelected(Event):
@@ -30,3 +34,14 @@ class ListItemSelected(Event):
     def __init__(self, sender, option: TextType) -> None:
         super().__init__(sender)
         self.selected = option
+
+
+class RenderStats(Event):
+    """
+    Posted every interval while instrumentation is reporting
+    `stats` maps each widget class name to what it has cost so far
+    """
+
+    def __init__(self, sender, stats: dict) -> None:
+        super().__init__(sender)
+        self.stats = stats
@@ -0,0 +1,36 @@
+from .text_buffer import GapBuffer
+from .validator import InputValidator
+from .word_index import WordIndex
+from .keys import key_pending
+from .edit_journal import Edit, EditJournal
+from .clipboard import Clipboard, SystemClipboard, LocalClipboard
+from .hover import HoverTracker
+from .paged_options import ListDataSource, PagedOptions
+from .compact_options import CompactOptions
+from .prefix_index import PrefixIndex
+from .ngram_index import NgramIndex
+from .fuzzy import FuzzyMatcher, best_ranked
+from .instrumentation import Instrumentation, WidgetStats, instrumentation
+
+__all__ = [
+    "GapBuffer",
+    "InputValidator",
+    "WordIndex",
+    "key_pending",
+    "Edit",
+    "EditJournal",
+    "Clipboard",
+    "SystemClipboard",
+    "LocalClipboard",
+    "HoverTracker",
+    "ListDataSource",
+    "PagedOptions",
+    "CompactOptions",
+    "PrefixIndex",
+    "NgramIndex",
+    "FuzzyMatcher",
+    "best_ranked",
+    "Instrumentation",
+    "WidgetStats",
+    "instrumentation",
+]
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+
+import pyperclip
+
+
+class Clipboard(ABC):
+    """
+    Where the text for ctrl+v comes from, subclass it to paste from elsewhere
+    `paste` is called from a daemon thread of its own when `blocking` is set,
+    so it is free to block
+    """
+
+    blocking = True
+    _pending: asyncio.Future | None = None
+
+    @abstractmethod
+    def paste(self) -> str:
+        ...
+
+    def read(self) -> asyncio.Future:
+        """
+        Starts a paste without blocking the event loop, while a read is
+        still running (e.g. a hung one) it is handed out instead of a new one
+        """
+
+        if self._pending is not None and not self._pending.done():
+            return self._pending
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        if not self.blocking:
+            try:
+                future.set_result(self.paste())
+            except Exception as error:
+                future.set_exception(error)
+
+            return future
+
+        def run() -> None:
+            try:
+                result, error = self.paste(), None
+            except Exception as exception:
+                result, error = None, exception
+
+            try:
+                loop.call_soon_threadsafe(_settle, future, result, error)
+            except RuntimeError:
+                # The loop was closed while the clipboard hung
+                pass
+
+        self._pending = future
+        threading.Thread(target=run, name="clipboard", daemon=True).start()
+        return future
+
+
+def _settle(
+    future: asyncio.Future, result: str | None, error: Exception | None
+) -> None:
+    if future.done():
+        return
+
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class SystemClipboard(Clipboard):
+    """
+    The system clipboard through pyperclip
+    """
+
+    def paste(self) -> str:
+        # Will throw an error if `xclip` if not installed on the linux(Xorg) system,
+        # should work just fine on windows and mac
+        return pyperclip.paste()
+
+
+class LocalClipboard(Clipboard):
+    """
+    A clipboard that only lives inside the app
+    """
+
+    blocking = False
+
+    def __init__(self, text: str = "") -> None:
+        self.text = text
+
+    def copy(self, text: str) -> None:
+        self.text = text
+
+    def paste(self) -> str:
+        return self.text
@@ -0,0 +1,99 @@
+from array import array
+from collections import OrderedDict
+from typing import Iterable, Iterator
+
+from rich.style import StyleType
+from rich.text import Text, TextType
+
+
+class CompactOptions:
+    """
+    A compact store for a very large number of List options
+
+    The text of every option lives in one UTF-8 buffer with an array of
+    offsets, and the style of each option (meta included) is a small code
+    into a table of the distinct styles. Text objects are only built for the
+    options being read and the last `cache_size` of them are kept
+    """
+
+    def __init__(
+        self, options: Iterable[TextType] = (), cache_size: int = 1024
+    ) -> None:
+        self.cache_size = cache_size
+        self._data = bytearray()
+        self._offsets = array("Q", [0])
+        self._styles = array("I")
+        self._style_table: list[StyleType] = [""]
+        self._style_codes: dict[StyleType, int] = {"": 0}
+
+        # Options with spans can't be reduced to a single style, so they are kept
+        self._rich: dict[int, Text] = {}
+        self._built: OrderedDict[int, Text] = OrderedDict()
+
+        self.extend(options)
+
+    def __len__(self) -> int:
+        return len(self._styles)
+
+    def __iter__(self) -> Iterator[Text]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _style_code(self, style: StyleType) -> int:
+        if (code := self._style_codes.get(style)) is None:
+            code = self._style_codes[style] = len(self._style_table)
+            self._style_table.append(style)
+
+        return code
+
+    def append(self, option: TextType) -> None:
+        """
+        Adds an option at the end
+        """
+
+        if isinstance(option, Text):
+            if option.spans:
+                self._rich[len(self)] = option
+
+            plain, style = option.plain, option.style
+        else:
+            plain, style = option, ""
+
+        self._data += plain.encode()
+        self._offsets.append(len(self._data))
+        self._styles.append(self._style_code(style))
+
+    def extend(self, options: Iterable[TextType]) -> None:
+        """
+        Adds many options at the end
+        """
+
+        for option in options:
+            self.append(option)
+
+    def plain(self, index: int) -> str:
+        """
+        Returns the text of an option without building a Text for it
+        """
+
+        return self._data[self._offsets[index] : self._offsets[index + 1]].decode()
+
+    def __getitem__(self, index: int) -> Text:
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("CompactOptions index out of range")
+
+        if (text := self._built.get(index)) is not None:
+            self._built.move_to_end(index)
+            return text
+
+        if (text := self._rich.get(index)) is None:
+            text = Text(self.plain(index), style=self._style_table[self._styles[index]])
+
+        self._built[index] = text
+        if len(self._built) > self.cache_size:
+            self._built.popitem(last=False)
+
+        return text
@@ -0,0 +1,148 @@
+from collections import deque
+from typing import NamedTuple
+
+
+class Edit(NamedTuple):
+    """
+    A single change: `deleted` at pos was replaced by `inserted`
+    """
+
+    pos: int
+    deleted: str
+    inserted: str
+
+
+# Rough cost of keeping an edit around apart from its text
+EDIT_OVERHEAD = 64
+
+
+class EditJournal:
+    """
+    An undo/redo history that stores the edits themselves instead of snapshots
+
+    Consecutive typing (or backspacing) is merged into a single step, edits
+    made inside a group form a single step, and the oldest steps are dropped
+    once the history goes over `max_bytes` (roughly measured)
+    """
+
+    def __init__(self, max_bytes: int = 1 << 20) -> None:
+        self.max_bytes = max_bytes
+        self.paused = False
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Forgets the whole history
+        """
+
+        self._undo: deque[list[Edit]] = deque()
+        self._redo: list[list[Edit]] = []
+        self._size = 0
+        self._depth = 0
+        self._fresh = False
+        self._sealed = True
+
+    @staticmethod
+    def _cost(step: list[Edit]) -> int:
+        return sum(
+            len(edit.deleted) + len(edit.inserted) + EDIT_OVERHEAD for edit in step
+        )
+
+    @staticmethod
+    def _merge(last: Edit, edit: Edit) -> Edit | None:
+        """
+        Merges typing and deleting letter by letter into a single edit
+        """
+
+        if len(edit.inserted) + len(edit.deleted) != 1:
+            return None
+
+        if not last.deleted and edit.inserted:
+            # A new word starts a new step
+            if edit.pos == last.pos + len(last.inserted) and not (
+                edit.inserted.isspace() and not last.inserted[-1].isspace()
+            ):
+                return Edit(last.pos, "", last.inserted + edit.inserted)
+
+        elif not last.inserted and edit.deleted:
+            if edit.pos + 1 == last.pos:  # backspace
+                return Edit(edit.pos, edit.deleted + last.deleted, "")
+            if edit.pos == last.pos:  # delete
+                return Edit(last.pos, last.deleted + edit.deleted, "")
+
+        return None
+
+    def begin_group(self) -> None:
+        """
+        Starts a group, everything recorded until the matching end_group
+        becomes a single step
+        """
+
+        self._depth += 1
+        if self._depth == 1:
+            self._fresh = True
+
+    def end_group(self) -> None:
+        self._depth -= 1
+        if not self._depth:
+            self._sealed = True
+
+    def record(self, pos: int, deleted: str, inserted: str) -> None:
+        """
+        Records that `deleted` at pos was replaced by `inserted`
+        """
+
+        if self.paused or not (deleted or inserted):
+            return
+
+        if self._redo:
+            self._size -= sum(self._cost(step) for step in self._redo)
+            self._redo.clear()
+
+        edit = Edit(pos, deleted, inserted)
+        self._size += self._cost([edit])
+
+        if self._depth and not self._fresh and self._undo:
+            self._undo[-1].append(edit)
+        elif (
+            not self._depth
+            and not self._sealed
+            and self._undo
+            and (merged := self._merge(self._undo[-1][-1], edit))
+        ):
+            self._undo[-1][-1] = merged
+            self._size -= EDIT_OVERHEAD
+        else:
+            self._undo.append([edit])
+
+        self._fresh = False
+        self._sealed = bool(self._depth)
+
+        while self._size > self.max_bytes and self._undo:
+            self._size -= self._cost(self._undo.popleft())
+
+    def undo(self) -> list[Edit] | None:
+        """
+        Takes the latest step off the history, to be reverted by the caller
+        """
+
+        if not self._undo:
+            return None
+
+        step = self._undo.pop()
+        self._redo.append(step)
+        self._sealed = True
+        return step
+
+    def redo(self) -> list[Edit] | None:
+        """
+        Takes the latest undone step back, to be applied again by the caller
+        """
+
+        if not self._redo:
+            return None
+
+        step = self._redo.pop()
+        self._undo.append(step)
+        self._sealed = True
+        return step
@@ -0,0 +1,170 @@
+import re
+from heapq import nlargest
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+
+BONUS_BOUNDARY = 8
+BONUS_SEPARATOR = 9
+BONUS_CAMEL = 7
+BONUS_CONSECUTIVE = 4
+BONUS_FIRST_LETTER = 2
+
+WORD_BOUNDARIES = " _-.,:;"
+PATH_SEPARATORS = "/\\"
+
+
+def _bonus(text: str, index: int) -> int:
+    """
+    Bonus for a match at index, for letters that start a word
+    """
+
+    if index == 0:
+        return BONUS_BOUNDARY
+
+    prev, letter = text[index - 1], text[index]
+    if prev in PATH_SEPARATORS:
+        return BONUS_SEPARATOR
+    if prev in WORD_BOUNDARIES:
+        return BONUS_BOUNDARY
+    if prev.islower() and letter.isupper():
+        return BONUS_CAMEL
+
+    return 0
+
+
+def _fold(text: str) -> str:
+    """
+    Lower case text letter by letter, letters that lower into more than
+    one (like "İ") are kept as they are so the positions still line up
+    """
+
+    if len(folded := text.lower()) == len(text):
+        return folded
+
+    return "".join(
+        lowered if len(lowered := letter.lower()) == 1 else letter for letter in text
+    )
+
+
+class FuzzyMatcher:
+    """
+    Scores texts holding the letters of a query in order, in the spirit
+    of fzf: letters that follow each other or start a word are worth more
+    and gaps between them cost
+
+    Made once per query, the query is only case sensitive when it has
+    upper case letters in it
+    """
+
+    def __init__(self, query: str) -> None:
+        self.query = query
+        self.case_sensitive = query != query.lower()
+        self._query = query if self.case_sensitive else _fold(query)
+
+        # a[^b]*b[^c]*c never backtracks, so texts without the
+        # letters in order are dropped quickly without scoring
+        pattern = "".join(
+            re.escape(letter)
+            if index == 0
+            else f"[^{re.escape(letter)}]*{re.escape(letter)}"
+            for index, letter in enumerate(query)
+        )
+        self._pattern = re.compile(pattern, 0 if self.case_sensitive else re.IGNORECASE)
+
+    def matches(self, text: str) -> bool:
+        return self._pattern.search(text) is not None
+
+    def match(self, text: str) -> tuple[int, list[int]] | None:
+        """
+        Returns the score and the positions of the matched letters,
+        None when the query letters are not in the text in order
+        """
+
+        query = self._query
+        if not query:
+            return 0, []
+
+        folded = text if self.case_sensitive else _fold(text)
+
+        # The first place the whole query fits ...
+        end = -1
+        for letter in query:
+            end = folded.find(letter, end + 1)
+            if end == -1:
+                return None
+
+        # ... and the shortest window ending there
+        start = end + 1
+        for letter in reversed(query):
+            start = folded.rfind(letter, 0, start)
+
+        positions = []
+        index = start
+        for letter in query:
+            index = folded.find(letter, index)
+            positions.append(index)
+            index += 1
+
+        return self._score(text, positions), positions
+
+    def _score(self, text: str, positions: list[int]) -> int:
+        score = 0
+        run_bonus = 0
+        prev = -1
+
+        for count, index in enumerate(positions):
+            bonus = _bonus(text, index)
+
+            if prev != -1 and index == prev + 1:
+                run_bonus = max(run_bonus, bonus, BONUS_CONSECUTIVE)
+                bonus = run_bonus
+            else:
+                if prev != -1:
+                    score += SCORE_GAP_START + SCORE_GAP_EXTENSION * (index - prev - 2)
+                run_bonus = bonus
+
+            if count == 0:
+                bonus *= BONUS_FIRST_LETTER
+
+            score += SCORE_MATCH + bonus
+            prev = index
+
+        return score
+
+    def rank(
+        self, texts: Iterable[str], start: int = 0
+    ) -> Iterator[tuple[int, int, int, int, list[int]]]:
+        """
+        (score, -length, -index, index, positions) for every matching text,
+        counting the indexes from start. Sorting them from the largest puts
+        equal scores with the shorter text and then the earlier one first
+        """
+
+        for index, text in enumerate(texts, start):
+            if (result := self.match(text)) is not None:
+                yield result[0], -len(text), -index, index, result[1]
+
+    def top(
+        self, items: Iterable[tuple[T, str]], limit: int
+    ) -> list[tuple[T, list[int]]]:
+        """
+        The `limit` best scoring (item, text) pairs with their matched
+        positions, best first
+        """
+
+        items = list(items)
+        best = best_ranked(limit, self.rank(text for _, text in items))
+        return [(items[entry[3]][0], entry[4]) for entry in best]
+
+
+def best_ranked(limit: int, ranked: Iterable[tuple]) -> list[tuple]:
+    """
+    The `limit` best entries made by `FuzzyMatcher.rank`, best first
+    """
+
+    return nlargest(limit, ranked, key=lambda entry: entry[:3])
@@ -0,0 +1,51 @@
+from typing import Any, Callable
+
+from textual.widget import Widget
+
+
+class HoverTracker:
+    """
+    Follows the row under the mouse for list-like widgets
+
+    Mouse moves that stay on the highlighted row of the widget (its
+    `highlighted` attribute) are dropped right away. The first other row is
+    applied at once, the ones that follow within `interval` are folded into
+    a single update at the end of it
+    """
+
+    def __init__(
+        self,
+        widget: Widget,
+        on_hover: Callable[[Any], None],
+        interval: float = 1 / 60,
+    ) -> None:
+        self.widget = widget
+        self.on_hover = on_hover
+        self.interval = interval
+        self._pending: Any = None
+        self._waiting = False
+
+    def update(self, row: Any) -> None:
+        """
+        Reports the row that is under the mouse now
+        """
+
+        if row is None:
+            return
+
+        if self._waiting:
+            self._pending = row
+            return
+
+        # The highlight may have moved with the keys since the last hover
+        if row != self.widget.highlighted:
+            self.on_hover(row)
+            self._waiting = True
+            self.widget.set_timer(self.interval, self._flush)
+
+    def _flush(self) -> None:
+        self._waiting = False
+        pending, self._pending = self._pending, None
+
+        if pending is not None and pending != self.widget.highlighted:
+            self.on_hover(pending)
@@ -0,0 +1,232 @@
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable
+
+from textual.message_pump import MessagePump
+from textual.widget import Widget
+
+from ..events import RenderStats
+
+_MISSING = object()
+
+
+class WidgetStats:
+    """
+    What one widget class has cost since the stats were last reset
+
+    The times are in seconds, `render_time` covers both building the
+    renderable and turning it into lines. The rows and characters are
+    counted from the lines textual renders the widget into
+    """
+
+    __slots__ = (
+        "refreshes",
+        "renders",
+        "render_time",
+        "keys",
+        "key_time",
+        "rows",
+        "chars",
+    )
+
+    def __init__(self) -> None:
+        self.refreshes = 0
+        self.renders = 0
+        self.render_time = 0.0
+        self.keys = 0
+        self.key_time = 0.0
+        self.rows = 0
+        self.chars = 0
+
+    def copy(self) -> "WidgetStats":
+        stats = WidgetStats()
+        for name in self.__slots__:
+            setattr(stats, name, getattr(self, name))
+
+        return stats
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"WidgetStats({fields})"
+
+
+class Instrumentation:
+    """
+    Opt-in counters for the widgets in `textual_extras.widgets`
+
+    `enable` swaps `refresh`, `render`, `render_tree`, `render_lines`,
+    `render_lines_free` and `on_key` of every widget class for counting
+    wrappers and `disable` puts the originals back, so nothing is paid while
+    it is off. The wrappers return what the originals do. The stats are kept
+    per widget class
+    """
+
+    methods = (
+        "refresh",
+        "render",
+        "render_tree",
+        "render_lines",
+        "render_lines_free",
+        "on_key",
+    )
+
+    def __init__(self) -> None:
+        self.stats: dict[str, WidgetStats] = {}
+        self._patched: list[tuple[type, str, Any]] = []
+        self._active: set[tuple[int, str]] = set()
+        self._rendering = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._patched)
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+
+        from .. import widgets
+
+        for name in widgets.__all__:
+            cls = getattr(widgets, name)
+            if not (isinstance(cls, type) and issubclass(cls, Widget)):
+                continue
+
+            for method in self.methods:
+                if (original := getattr(cls, method, None)) is None:
+                    continue
+
+                self._patched.append((cls, method, cls.__dict__.get(method, _MISSING)))
+                setattr(cls, method, self._wrap(method, original))
+
+    def disable(self) -> None:
+        for cls, method, original in reversed(self._patched):
+            if original is _MISSING:
+                delattr(cls, method)
+            else:
+                setattr(cls, method, original)
+
+        self._patched.clear()
+        self._active.clear()
+        self._rendering = 0
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+    def snapshot(self) -> dict[str, WidgetStats]:
+        """
+        Returns a copy of the stats that later calls will not change
+        """
+
+        return {name: stats.copy() for name, stats in self.stats.items()}
+
+    def report(self, target: MessagePump, interval: float = 1) -> Any:
+        """
+        Posts a `RenderStats` event with a snapshot to `target` every
+        `interval` seconds, returns the timer so it can be stopped
+        """
+
+        def post() -> None:
+            target.post_message_no_wait(RenderStats(target, self.snapshot()))
+
+        return target.set_interval(interval, post)
+
+    def _stats_for(self, widget: Widget) -> WidgetStats:
+        name = type(widget).__name__
+        if (stats := self.stats.get(name)) is None:
+            stats = self.stats[name] = WidgetStats()
+
+        return stats
+
+    def _wrap(self, method: str, original: Callable) -> Callable:
+        # subclasses get their own wrappers, a call that goes through
+        # super() is only counted once, at the outermost one
+        active = self._active
+
+        if method == "refresh":
+
+            @wraps(original)
+            def refresh(widget: Widget, *args, **kwargs) -> Any:
+                key = (id(widget), method)
+                if key in active:
+                    return original(widget, *args, **kwargs)
+
+                self._stats_for(widget).refreshes += 1
+                active.add(key)
+                try:
+                    return original(widget, *args, **kwargs)
+                finally:
+                    active.discard(key)
+
+            return refresh
+
+        if method == "on_key":
+
+            @wraps(original)
+            async def on_key(widget: Widget, *args, **kwargs) -> Any:
+                key = (id(widget), method)
+                if key in active:
+                    return await original(widget, *args, **kwargs)
+
+                stats = self._stats_for(widget)
+                active.add(key)
+                start = perf_counter()
+                try:
+                    return await original(widget, *args, **kwargs)
+                finally:
+                    stats.key_time += perf_counter() - start
+                    stats.keys += 1
+                    active.discard(key)
+
+            return on_key
+
+        if method in ("render_lines", "render_lines_free"):
+
+            @wraps(original)
+            def render_lines(widget: Widget, *args, **kwargs) -> Any:
+                if self._rendering:
+                    return original(widget, *args, **kwargs)
+
+                stats = self._stats_for(widget)
+                self._rendering += 1
+                start = perf_counter()
+                try:
+                    return original(widget, *args, **kwargs)
+                finally:
+                    stats.render_time += perf_counter() - start
+                    stats.renders += 1
+                    self._rendering -= 1
+
+                    if (cache := widget.render_cache) is not None:
+                        stats.rows += len(cache.lines)
+                        stats.chars += sum(
+                            len(segment.text)
+                            for line in cache.lines
+                            for segment in line
+                            if not segment.control
+                        )
+
+            return render_lines
+
+        @wraps(original)
+        def render(widget: Widget, *args, **kwargs) -> Any:
+            # rows that a widget builds by rendering other widgets (and
+            # render() calling render_tree()) count towards the outer one,
+            # which includes the ones rendered lazily while textual turns
+            # the outer renderable into lines
+            if self._rendering:
+                return original(widget, *args, **kwargs)
+
+            stats = self._stats_for(widget)
+            self._rendering += 1
+            start = perf_counter()
+            try:
+                return original(widget, *args, **kwargs)
+            finally:
+                stats.render_time += perf_counter() - start
+                stats.renders += 1
+                self._rendering -= 1
+
+        return render
+
+
+instrumentation = Instrumentation()
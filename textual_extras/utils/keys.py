@@ -0,0 +1,11 @@
+from textual import events
+from textual.message_pump import MessagePump
+
+
+def key_pending(widget: MessagePump) -> bool:
+    """
+    Checks if another key is already waiting in the queue of the widget,
+    in which case the work after a key can wait for the last key of the burst
+    """
+
+    return isinstance(widget.peek_message(), events.Key)
@@ -0,0 +1,87 @@
+from typing import Hashable
+
+
+class NgramIndex:
+    """
+    Maps every run of `n` letters to the keys of the texts holding it
+
+    Looking up a text of at least `n` letters returns the keys of the texts
+    that hold all of its runs, a small superset of the ones containing it,
+    so the candidates still have to be checked
+    """
+
+    def __init__(self, n: int = 3) -> None:
+        self.n = n
+        self._postings: dict[str, set[Hashable]] = {}
+        self._grams: dict[Hashable, set[str]] = {}
+
+    def _grams_of(self, text: str) -> set[str]:
+        return {text[i : i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._grams
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._grams.clear()
+
+    def add(self, key: Hashable, text: str) -> None:
+        self.update(key, text)
+
+    def update(self, key: Hashable, text: str) -> None:
+        """
+        Indexes the text under key, replacing what key held before
+        """
+
+        old = self._grams.get(key, set())
+        new = self._grams_of(text)
+
+        for gram in old - new:
+            self._discard(gram, key)
+
+        for gram in new - old:
+            self._postings.setdefault(gram, set()).add(key)
+
+        self._grams[key] = new
+
+    def remove(self, key: Hashable) -> None:
+        for gram in self._grams.pop(key, ()):
+            self._discard(gram, key)
+
+    def _discard(self, gram: str, key: Hashable) -> None:
+        keys = self._postings[gram]
+        keys.discard(key)
+        if not keys:
+            del self._postings[gram]
+
+    def candidates(self, text: str, limit: int | None = None) -> set[Hashable] | None:
+        """
+        Keys of the texts that may contain text, None when text is too
+        short for the index to tell or when even its rarest run is held
+        by more than limit texts
+        """
+
+        if len(text) < self.n:
+            return None
+
+        postings = []
+        for gram in self._grams_of(text):
+            if (keys := self._postings.get(gram)) is None:
+                return set()
+            postings.append(keys)
+
+        # Start from the rarest run so the intersections stay small
+        postings.sort(key=len)
+        if limit is not None and len(postings[0]) > limit:
+            return None
+
+        result = set(postings[0])
+        for keys in postings[1:]:
+            result &= keys
+            if not result:
+                break
+
+        return result
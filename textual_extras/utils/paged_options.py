@@ -0,0 +1,170 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from inspect import isawaitable
+from time import monotonic
+from typing import Awaitable, Callable, Sequence
+
+from rich.text import Text, TextType
+
+
+class ListDataSource(ABC):
+    """
+    Where a List gets its options from when they should not all be in memory
+
+    Subclasses tell the number of options and hand out a range of them,
+    `get_range` may also be a coroutine (e.g. for a database query)
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def get_range(
+        self, start: int, stop: int
+    ) -> Sequence[TextType] | Awaitable[Sequence[TextType]]:
+        ...
+
+
+class PagedOptions:
+    """
+    A read-only sequence over a ListDataSource that loads it page by page
+
+    Only the most recently used `max_pages` pages are kept. An option whose
+    page is still loading reads as `placeholder` and `on_load` is called
+    once the page arrives
+
+    A page that failed to load is not asked for again for `retry_delay`
+    seconds. `on_error` is told about it once, until the page loads or the
+    pages are invalidated, without it the event loop's exception handler is
+    """
+
+    placeholder: TextType = Text("…", style="dim white")
+
+    def __init__(
+        self,
+        source: ListDataSource,
+        page_size: int = 256,
+        max_pages: int = 64,
+        on_load: Callable[[], None] | None = None,
+        on_error: Callable[[int, Exception], None] | None = None,
+        retry_delay: float = 5,
+    ) -> None:
+        self.source = source
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.on_load = on_load
+        self.on_error = on_error
+        self.retry_delay = retry_delay
+        self._pages: OrderedDict[int, Sequence[TextType]] = OrderedDict()
+        self._loading: dict[int, asyncio.Task] = {}
+        # page -> when it may be asked for again after failing
+        self._failed: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def __getitem__(self, index: int) -> TextType:
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("PagedOptions index out of range")
+
+        page, offset = divmod(index, self.page_size)
+        if (items := self._get_page(page)) is None:
+            return self.placeholder
+
+        return items[offset] if offset < len(items) else self.placeholder
+
+    def is_loaded(self, index: int) -> bool:
+        """
+        Whether the option at index has arrived, it reads as the
+        placeholder until then
+        """
+
+        page, offset = divmod(index, self.page_size)
+        return (items := self._pages.get(page)) is not None and offset < len(items)
+
+    def _get_page(self, page: int) -> Sequence[TextType] | None:
+        if page in self._pages:
+            self._pages.move_to_end(page)
+            return self._pages[page]
+
+        self._request(page)
+        return self._pages.get(page)
+
+    def _request(self, page: int) -> None:
+        if page in self._loading or self._failed.get(page, 0) > monotonic():
+            return
+
+        start = page * self.page_size
+        result = self.source.get_range(start, min(start + self.page_size, len(self)))
+
+        if isawaitable(result):
+            loop = asyncio.get_running_loop()
+            self._loading[page] = loop.create_task(self._load(page, result))
+        else:
+            self._store(page, result)
+
+    async def _load(self, page: int, result: Awaitable[Sequence[TextType]]) -> None:
+        try:
+            items = await result
+        except Exception as error:
+            self._failed_to_load(page, error)
+            return
+        finally:
+            self._loading.pop(page, None)
+
+        self._failed.pop(page, None)
+        self._store(page, items)
+        if self.on_load:
+            self.on_load()
+
+    def _failed_to_load(self, page: int, error: Exception) -> None:
+        reported = page in self._failed
+        self._failed[page] = monotonic() + self.retry_delay
+        if reported:
+            return
+
+        if self.on_error:
+            self.on_error(page, error)
+        else:
+            asyncio.get_running_loop().call_exception_handler(
+                {
+                    "message": f"Loading page {page} of {self.source!r} failed",
+                    "exception": error,
+                }
+            )
+
+    def _store(self, page: int, items: Sequence[TextType]) -> None:
+        self._pages[page] = items
+        self._pages.move_to_end(page)
+
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def prefetch(self, start: int, stop: int) -> None:
+        """
+        Makes sure the pages around start:stop are loaded or on their way
+        """
+
+        first = max(start // self.page_size - 1, 0)
+        last = min(stop // self.page_size + 1, (len(self) - 1) // self.page_size)
+
+        for page in range(first, last + 1):
+            if page not in self._pages:
+                self._request(page)
+
+    def invalidate(self) -> None:
+        """
+        Forgets every loaded page, e.g. after the source has changed
+        """
+
+        for task in self._loading.values():
+            task.cancel()
+
+        self._loading.clear()
+        self._pages.clear()
+        self._failed.clear()
@@ -0,0 +1,83 @@
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from typing import Sequence
+
+from rich.text import TextType
+
+from .compact_options import CompactOptions
+
+
+class PrefixIndex:
+    """
+    The options of a list sorted by their casefolded text
+
+    Built lazily on the first lookup with one sort, options appended later
+    are sorted on their own and merged in through `update`, so finding the
+    first option that starts with a prefix is a bisect
+    """
+
+    # Below this many new options inserting them one by one beats a merge
+    merge_threshold = 64
+
+    def __init__(self) -> None:
+        self._keys: list[str] = []
+        self._indexes: list[int] = []
+        self._source: Sequence[TextType] | None = None
+
+    def add(self, text: str, index: int) -> None:
+        key = text.casefold()
+        pos = bisect_right(self._keys, key)
+        self._keys.insert(pos, key)
+        self._indexes.insert(pos, index)
+
+    def update(self, options: Sequence[TextType]) -> None:
+        """
+        Indexes the options not seen yet, starts over for a different list
+        """
+
+        if options is not self._source:
+            self._keys.clear()
+            self._indexes.clear()
+            self._source = options
+
+        start = len(self._keys)
+        if len(options) - start < self.merge_threshold:
+            for index in range(start, len(options)):
+                self.add(_plain(options, index), index)
+            return
+
+        batch = sorted(
+            (_plain(options, index).casefold(), index)
+            for index in range(start, len(options))
+        )
+        if start:
+            # Equal keys keep the older options first, like add does
+            batch = list(merge(zip(self._keys, self._indexes), batch))
+
+        self._keys = [key for key, _ in batch]
+        self._indexes = [index for _, index in batch]
+
+    def is_built_for(self, options: Sequence[TextType]) -> bool:
+        return options is self._source
+
+    def find(self, options: Sequence[TextType], prefix: str) -> int | None:
+        """
+        Index of the first option in sorted order that starts with prefix
+        """
+
+        self.update(options)
+        prefix = prefix.casefold()
+        pos = bisect_left(self._keys, prefix)
+
+        if pos < len(self._keys) and self._keys[pos].startswith(prefix):
+            return self._indexes[pos]
+
+        return None
+
+
+def _plain(options: Sequence[TextType], index: int) -> str:
+    if isinstance(options, CompactOptions):
+        return options.plain(index)
+
+    option = options[index]
+    return option if isinstance(option, str) else option.plain
@@ -0,0 +1,138 @@
+class GapBuffer:
+    """
+    A text buffer with a movable gap for cheap edits around the cursor
+
+    Inserting or deleting at the gap is O(1) amortized, moving the gap
+    costs the distance moved. The plain string is only built on demand
+    and cached until the next edit
+    """
+
+    def __init__(self, text: str = "", gap: int = 64) -> None:
+        self._min_gap = gap
+        self.version = 0
+        self._load(text)
+
+    def _load(self, text: str) -> None:
+        self._data: list[str] = list(text) + [""] * self._min_gap
+        self._gap_start = len(text)
+        self._gap_end = len(self._data)
+        self._text: str | None = text
+
+    def set(self, text: str) -> None:
+        """
+        Replaces the whole content of the buffer
+        """
+
+        self._load(text)
+        self.version += 1
+
+    def __len__(self) -> int:
+        return len(self._data) - (self._gap_end - self._gap_start)
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("GapBuffer index out of range")
+
+        if index >= self._gap_start:
+            index += self._gap_end - self._gap_start
+
+        return self._data[index]
+
+    def __str__(self) -> str:
+        return self.text
+
+    @property
+    def text(self) -> str:
+        """
+        The content of the buffer as a plain string
+        """
+
+        if self._text is None:
+            self._text = "".join(self._data[: self._gap_start]) + "".join(
+                self._data[self._gap_end :]
+            )
+
+        return self._text
+
+    def slice(self, start: int, end: int) -> str:
+        """
+        Returns the text between start and end without building the whole string
+        """
+
+        start = max(start, 0)
+        end = min(end, len(self))
+        if start >= end:
+            return ""
+
+        if self._text is not None:
+            return self._text[start:end]
+
+        gap = self._gap_end - self._gap_start
+        if end <= self._gap_start:
+            return "".join(self._data[start:end])
+        elif start >= self._gap_start:
+            return "".join(self._data[start + gap : end + gap])
+        else:
+            return "".join(self._data[start : self._gap_start]) + "".join(
+                self._data[self._gap_end : end + gap]
+            )
+
+    def insert(self, pos: int, text: str) -> None:
+        """
+        Inserts text at the given position
+        """
+
+        if not text:
+            return
+
+        self._move_gap(pos)
+        self._ensure_gap(len(text))
+        self._data[self._gap_start : self._gap_start + len(text)] = text
+        self._gap_start += len(text)
+        self._changed()
+
+    def delete(self, start: int, end: int) -> None:
+        """
+        Deletes the text between start and end
+        """
+
+        start = max(start, 0)
+        end = min(end, len(self))
+        if start >= end:
+            return
+
+        self._move_gap(start)
+        self._gap_end += end - start
+        self._changed()
+
+    def _changed(self) -> None:
+        self._text = None
+        self.version += 1
+
+    def _move_gap(self, pos: int) -> None:
+        pos = max(0, min(pos, len(self)))
+        data = self._data
+
+        if pos < self._gap_start:
+            count = self._gap_start - pos
+            data[self._gap_end - count : self._gap_end] = data[pos : self._gap_start]
+            self._gap_start = pos
+            self._gap_end -= count
+
+        elif pos > self._gap_start:
+            count = pos - self._gap_start
+            data[self._gap_start : pos] = data[self._gap_end : self._gap_end + count]
+            self._gap_start = pos
+            self._gap_end += count
+
+    def _ensure_gap(self, size: int) -> None:
+        if self._gap_end - self._gap_start >= size:
+            return
+
+        # Grow geometrically so that repeated inserts stay amortized O(1)
+        grow = max(size, len(self._data), self._min_gap)
+        self._data[self._gap_end : self._gap_end] = [""] * grow
+        self._gap_end += grow
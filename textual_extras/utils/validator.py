@@ -0,0 +1,64 @@
+import re
+from typing import Literal
+
+
+class InputValidator:
+    """
+    Checks input against a blacklist/whitelist and optional value rules
+
+    The letter list is compiled once into a character class, so checking
+    a whole paste is a single regex pass. Entries written as `[...]`
+    (e.g. `"[a-z]"` or `"[0-9]"`) are used as character classes as they are
+    """
+
+    def __init__(
+        self,
+        list: tuple[Literal["blacklist", "whitelist"], list[str]] = ("blacklist", []),
+        max_length: int | None = None,
+        pattern: str | re.Pattern | None = None,
+    ) -> None:
+        self.rules = list
+        self.max_length = max_length
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+
+        mode, letters = list
+        letter_class = "".join(self._class_part(entry) for entry in letters)
+
+        if mode == "whitelist":
+            # An empty whitelist allows nothing at all
+            self._invalid = re.compile(
+                f"[^{letter_class}]" if letter_class else ".", re.DOTALL
+            )
+        else:
+            self._invalid = re.compile(f"[{letter_class}]") if letter_class else None
+
+    @staticmethod
+    def _class_part(entry: str) -> str:
+        if len(entry) > 2 and entry.startswith("[") and entry.endswith("]"):
+            return entry[1:-1]
+
+        return re.escape(entry)
+
+    def find_invalid(self, text: str) -> list[int]:
+        """
+        Returns the positions of the letters in text that are not allowed
+        """
+
+        if self._invalid is None:
+            return []
+
+        return [match.start() for match in self._invalid.finditer(text)]
+
+    def fits(self, length: int) -> bool:
+        """
+        Checks if a value of the given length is allowed
+        """
+
+        return self.max_length is None or length <= self.max_length
+
+    def matches(self, value: str) -> bool:
+        """
+        Checks if the whole value matches the pattern, if there is one
+        """
+
+        return self.pattern is None or self.pattern.fullmatch(value) is not None
@@ -0,0 +1,92 @@
+import re
+from bisect import bisect_left, bisect_right
+
+from .text_buffer import GapBuffer
+
+
+class WordIndex:
+    """
+    Sorted positions of the word starts in a buffer
+
+    Built lazily on the first word jump and then patched around every
+    edit reported through `update`, so jumps are bisect lookups
+    """
+
+    def __init__(self, buffer: GapBuffer, delimiters: str = " ") -> None:
+        self.buffer = buffer
+        self.delimiters = delimiters
+        self._starts: list[int] | None = None
+        self._version = -1
+
+    @property
+    def delimiters(self) -> str:
+        return self._delimiters
+
+    @delimiters.setter
+    def delimiters(self, delimiters: str) -> None:
+        self._delimiters = delimiters
+        self._starts = None
+
+        # A word starts at a non delimiter which is first or follows a delimiter
+        if delimiters:
+            letters = "".join(re.escape(letter) for letter in delimiters)
+            self._pattern = re.compile(f"(?:^|(?<=[{letters}]))[^{letters}]", re.DOTALL)
+        else:
+            self._pattern = re.compile("^.", re.DOTALL)
+
+    def _build(self) -> list[int]:
+        if self._starts is None or self._version != self.buffer.version:
+            self._starts = [
+                match.start() for match in self._pattern.finditer(self.buffer.text)
+            ]
+            self._version = self.buffer.version
+
+        return self._starts
+
+    def update(self, pos: int, removed: int, inserted: int) -> None:
+        """
+        Patches the index after `removed` letters at pos were replaced
+        by `inserted` letters, must be called once per buffer edit
+        """
+
+        if self._starts is None:
+            return
+
+        if self._version + 1 != self.buffer.version:
+            self._starts = None
+            return
+
+        self._version = self.buffer.version
+        starts = self._starts
+        lo = bisect_left(starts, pos)
+        hi = bisect_right(starts, pos + removed)
+
+        # Only the new text and the letter right after it can change their state
+        offset = max(pos - 1, 0)
+        window = self.buffer.slice(offset, pos + inserted + 1)
+        fresh = [
+            offset + match.start()
+            for match in self._pattern.finditer(window)
+            if offset + match.start() >= pos
+        ]
+
+        delta = inserted - removed
+        starts[lo:] = fresh + [start + delta for start in starts[hi:]]
+
+    def previous_start(self, pos: int) -> int:
+        """
+        Returns the closest word start before pos
+        """
+
+        starts = self._build()
+        index = bisect_left(starts, pos)
+        return starts[index - 1] if index else 0
+
+    def next_start(self, pos: int) -> int:
+        """
+        Returns the closest word start after pos
+        """
+
+        starts = self._build()
+        index = bisect_right(starts, pos)
+        return starts[index] if index < len(starts) else len(self.buffer)
@@ -1,3 +1,6 @@
+from time import monotonic
+from typing import Iterable
+
 from rich.console import RenderableType
 from rich.tree import Tree
 from rich.panel import Panel
@@ -7,26 +10,46 @@ from textual.widget import Widget
 from textual import events
 
 from ..events import ListItemSelected
+from ..utils import (
+    CompactOptions,
+    HoverTracker,
+    ListDataSource,
+    PagedOptions,
+    PrefixIndex,
+)
 
 
 class List(Widget):
     """
     A list class to show and select the items in a list
+    The options can also come from a ListDataSource, which is then read
+    page by page around the visible rows, or a CompactOptions for lists
+    too large to keep as separate Text objects
+
+    Typing quickly jumps to the first option starting with the typed text,
+    j/k/g/G only start it after another letter was typed
     """
 
     def __init__(
         self,
         name: str | None = None,
-        options: list[TextType] = [],
+        options: list[TextType] | CompactOptions | ListDataSource = [],
         style_unfocused: StyleType = "",
         style_focused: StyleType = "bold green",
         pad: bool = True,
         rotate: bool = False,
         wrap: bool = True,
         panel: Panel = Panel(""),
+        type_ahead_timeout: float = 1,
     ) -> None:
         super().__init__(name)
-        self.options = options
+        self.options: list[TextType] | CompactOptions | PagedOptions = (
+            PagedOptions(
+                options, on_load=self._refresh_rows, on_error=self._page_failed
+            )
+            if isinstance(options, ListDataSource)
+            else options
+        )
         self.style_unfocused = style_unfocused
         self.style_focused = style_focused
         self.pad = pad
@@ -34,10 +57,36 @@ class List(Widget):
         self.rotate = rotate
         self.wrap = wrap
         self.highlighted = 0
+        self.scroll_offset = 0
+        self._hover = HoverTracker(self, self.highlight)
+        self.type_ahead_timeout = type_ahead_timeout
+        self._prefix = PrefixIndex()
+        self._typed = ""
+        self._typed_at = 0.0
+
+        # index -> (option, is highlighted, finished row)
+        self._rows: dict[int, tuple[TextType, bool, Text]] = {}
+        self._rows_key: tuple | None = None
+        self._rendered_count = 0
 
     def highlight(self, id: int) -> None:
+        prev = self.highlighted
         self.highlighted = id
-        self.refresh(layout=True)
+        self._refresh_rows(prev, id)
+
+    def _refresh_rows(self, *indexes: int) -> None:
+        """
+        Repaints the widget with only the given rows built again,
+        the layout is redone only when the number of options has changed
+        """
+
+        for index in indexes:
+            self._rows.pop(index, None)
+
+        self.refresh(layout=len(self.options) != self._rendered_count)
+
+    def _page_failed(self, page: int, error: Exception) -> None:
+        self.log(f"Loading page {page} of the options failed: {error!r}")
 
     def move_cursor_down(self) -> None:
         """
@@ -74,9 +123,47 @@ class List(Widget):
 
         self.highlight(len(self.options) - 1)
 
+    def jump_to_prefix(self, prefix: str) -> bool:
+        """
+        Highlights the first option in sorted order that starts with prefix,
+        returns whether there was one
+        """
+
+        if isinstance(self.options, PagedOptions):
+            return False
+
+        index = self._prefix.find(self.options, prefix)
+        if index is None:
+            return False
+
+        self.highlight(index)
+        return True
+
+    def _type_ahead(self, key: str) -> bool:
+        """
+        Adds the key to the typed prefix and jumps, returns whether
+        the key was taken
+        """
+
+        if len(key) != 1 or not key.isprintable():
+            return False
+
+        now = monotonic()
+        typing = self._typed and now - self._typed_at < self.type_ahead_timeout
+        if not typing and key in "jkgG":
+            return False
+
+        self._typed = (self._typed if typing else "") + key
+        self._typed_at = now
+        self.jump_to_prefix(self._typed)
+        return True
+
     async def on_key(self, event: events.Key) -> None:
         event.stop()
 
+        if self._type_ahead(event.key):
+            return
+
         match event.key:
             case "j" | "down":
                 self.move_cursor_down()
@@ -87,17 +174,54 @@ class List(Widget):
             case "G" | "end":
                 self.move_cursor_to_bottom()
             case "enter":
-                await self.emit(ListItemSelected(self, self.options[self.highlighted]))
+                await self._select_highlighted()
 
     async def on_mouse_move(self, event: events.MouseMove) -> None:
         """
         Move the highlight along with mouse hover
         """
-        self.highlight(event.style.meta.get("selected"))
+        self._hover.update(event.style.meta.get("selected"))
 
     def add_option(self, option: TextType) -> None:
-        self.options.append(option)
-        self.refresh()
+        self.extend_options([option])
+
+    def extend_options(self, options: Iterable[TextType]) -> None:
+        """
+        Adds many options at once with a single refresh
+        """
+
+        if isinstance(self.options, PagedOptions):
+            raise TypeError("Options from a ListDataSource are read-only")
+
+        self.options.extend(options)
+        if self._prefix.is_built_for(self.options):
+            self._prefix.update(self.options)
+
+        self._refresh_rows()
+
+    def _visible_rows(self) -> int:
+        """
+        Number of options that fit in the panel
+        """
+
+        # Not laid out yet, so there is no way to tell
+        if not self.size.height:
+            return len(self.options)
+
+        # 1 border on each side
+        return max(self.size.height - 2, 1)
+
+    def _scroll_to_highlighted(self, rows: int) -> None:
+        """
+        Moves the scroll offset so that the highlighted option stays visible
+        """
+
+        if self.highlighted < self.scroll_offset:
+            self.scroll_offset = self.highlighted
+        elif self.highlighted >= self.scroll_offset + rows:
+            self.scroll_offset = self.highlighted - rows + 1
+
+        self.scroll_offset = max(0, min(self.scroll_offset, len(self.options) - rows))
 
     def render(self) -> RenderableType:
 
@@ -108,31 +232,75 @@ class List(Widget):
         tree.hide_root = True
         tree.expanded = True
 
-        for index, option in enumerate(self.options):
-            if isinstance(option, str):
-                option = Text(option)
+        # Only the options inside the window are built
+        rows = self._visible_rows()
+        self._scroll_to_highlighted(rows)
+        start = self.scroll_offset
+        end = min(start + rows, len(self.options))
+
+        if isinstance(self.options, PagedOptions):
+            self.options.prefetch(start, end)
 
-            option.pad_right(width - len(option) - 1)
-            option = Text(" ") + option
+        # Rows are only built again when their option or highlight changes
+        key = (width, self.wrap, self.style_focused, self.style_unfocused)
+        if key != self._rows_key:
+            self._rows_key = key
+            self._rows.clear()
 
-            if self.wrap:
-                option.plain = option.plain[:width]
+        cache: dict[int, tuple[TextType, bool, Text]] = {}
+        for index in range(start, end):
+            option = self.options[index]
+            is_highlighted = index == self.highlighted
 
-            if index != self.highlighted:
-                option.stylize(self.style_unfocused)
+            cached = self._rows.get(index)
+            if cached and cached[0] is option and cached[1] == is_highlighted:
+                row = cached[2]
             else:
-                option.stylize(self.style_focused)
+                row = self._render_row(index, option, is_highlighted, width)
 
-            meta = {
-                "@click": f"click_label({index})",
-                "selected": index,
-            }
-            option.apply_meta(meta)
-            tree.add(option)
+            cache[index] = (option, is_highlighted, row)
+            tree.add(row)
 
+        self._rows = cache
+        self._rendered_count = len(self.options)
         self.panel.renderable = tree
         return self.panel
 
+    def _render_row(
+        self, index: int, option: TextType, is_highlighted: bool, width: int
+    ) -> Text:
+        """
+        Builds the styled row for an option, the option itself is left as it is
+        """
+
+        row = Text(option) if isinstance(option, str) else option.copy()
+
+        row.pad_right(width - len(row) - 1)
+        row = Text(" ") + row
+
+        if self.wrap:
+            row.plain = row.plain[:width]
+
+        if is_highlighted:
+            row.stylize(self.style_focused)
+        else:
+            row.stylize(self.style_unfocused)
+
+        meta = {
+            "@click": f"click_label({index})",
+            "selected": index,
+        }
+        row.apply_meta(meta)
+        return row
+
+    async def _select_highlighted(self) -> None:
+        # An option still loading from the data source is only a placeholder
+        paged = isinstance(self.options, PagedOptions)
+        if paged and not self.options.is_loaded(self.highlighted):
+            return
+
+        await self.emit(ListItemSelected(self, self.options[self.highlighted]))
+
     async def action_click_label(self, id):
         self.highlight(id)
-        await self.emit(ListItemSelected(self, self.options[self.highlighted]))
+        await self._select_highlighted()
@@ -2,6 +2,7 @@ from textual import events
 
 from . import SingleLevelTreeEdit
 from ..events import ListItemSelected
+from ..utils import key_pending
 
 
 class ListEdit(SingleLevelTreeEdit):
@@ -42,4 +43,5 @@ class ListEdit(SingleLevelTreeEdit):
                         )
                     )
 
-        self.refresh()
+        if not (self.batch_keys and key_pending(self)):
+            self.refresh()
@@ -1,5 +1,6 @@
 from textual import events
 from .single_level_tree_edit import SingleLevelTreeEdit
+from ..utils import key_pending
 
 
 class MultiLineTextInput(SingleLevelTreeEdit):
@@ -59,4 +60,5 @@ class MultiLineTextInput(SingleLevelTreeEdit):
         if self.current_opt:
             self._cursor_column = self.current_opt._cursor_position
 
-        self.refresh()
+        if not (self.batch_keys and key_pending(self)):
+            self.refresh()
@@ -3,13 +3,20 @@ from rich.padding import PaddingDimensions
 from rich.style import StyleType
 from rich.text import Text, TextType
 from textual import events
+from textual.reactive import Reactive
 from textual.widgets import TreeControl, TreeNode, NodeID
 from textual_extras.widgets.text_input import View
 
 from . import SimpleInput
+from ..utils import HoverTracker, key_pending
 
 
 class NestedListEdit(TreeControl):
+    batch_keys: bool = True
+
+    # Moving the cursor only restyles rows, so it needs no layout
+    cursor: Reactive[NodeID] = Reactive(NodeID(0))
+
     def __init__(
         self,
         label: TextType,
@@ -27,9 +34,18 @@ class NestedListEdit(TreeControl):
         self.style_unfocus = style_unfocus
         self.style_editing = style_editing
         self.editing = False
+
+        # node id -> (rendered data, is highlighted, width, finished row)
+        self._rows: dict[NodeID, tuple[RenderableType, bool, int, Text]] = {}
+        self._hover = HoverTracker(self, self._hover_node)
+
+        self.highlighted = self.root.id
         self.highlight(self.root.id)
 
     def highlight(self, id: NodeID) -> None:
+        self._rows.pop(self.highlighted, None)
+        self._rows.pop(id, None)
+
         self.highlighted = id
         self.cursor = id
         self.refresh()
@@ -57,6 +73,7 @@ class NestedListEdit(TreeControl):
             else:
                 await self.cursor_up()
 
+        self._rows.pop(node.id, None)
         parent = node.parent or self.root
         for index, child in enumerate(parent.children):
             if child == node:
@@ -172,7 +189,8 @@ class NestedListEdit(TreeControl):
                 case "x":
                     await self.remove_node()
 
-        self.refresh()
+        if not (self.batch_keys and key_pending(self)):
+            self.refresh()
 
     async def on_mouse_move(self, event: events.MouseMove) -> None:
         """
@@ -180,7 +198,11 @@ class NestedListEdit(TreeControl):
         """
         if not self.editing:
             if id := event.style.meta.get("tree_node"):
-                self.highlight(id)
+                self._hover.update(id)
+
+    def _hover_node(self, id: NodeID) -> None:
+        if not self.editing:
+            self.highlight(id)
 
     def render_node(self, node: TreeNode) -> RenderableType:
 
@@ -191,10 +213,18 @@ class NestedListEdit(TreeControl):
 
     def render_custom_node(self, node) -> RenderableType:
 
+        data = node.data.render() if isinstance(node.label, str) else node.label
+        state = (node.id == self.highlighted, self.size.width)
+
+        # Rows are only built again when their data or highlight changes
+        cached = self._rows.get(node.id)
+        if cached and cached[0] is data and cached[1:3] == state:
+            return cached[3]
+
         label = (
-            Text(str(node.data.render()), no_wrap=True)
+            Text(str(data), no_wrap=True)
             if isinstance(node.label, str)
-            else node.label
+            else node.label.copy()
         )
         label.pad_right(self.size.width)
 
@@ -209,6 +239,7 @@ class NestedListEdit(TreeControl):
         }
 
         label.apply_meta(meta)
+        self._rows[node.id] = (data, *state, label)
         return label
 
     async def handle_tree_click(self, _) -> None:
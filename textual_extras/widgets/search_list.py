@@ -1,3 +1,9 @@
+import asyncio
+import re
+from array import array
+from collections import OrderedDict
+from typing import Literal
+
 from rich.console import RenderableType
 from rich.style import StyleType
 from rich.text import Text, TextType
@@ -5,11 +11,30 @@ from rich.tree import Tree
 from textual import events
 
 from ..events import ListItemSelected
-from .single_level_tree_edit import SingleLevelTreeEdit
+from ..utils import FuzzyMatcher, NgramIndex, best_ranked, key_pending
+from .single_level_tree_edit import SimpleInput, SingleLevelTreeEdit
 from .text_input import TextInput, View
 
 
 class SearchList(SingleLevelTreeEdit):
+    """
+    A list with a search box that narrows the options down to the ones
+    containing the search, `ngram_index=True` keeps an index of the option
+    values so searches of 3 or more letters only look at likely options
+
+    With `match_mode="fuzzy"` an option matches when it holds the letters
+    of the search in order, and only the `fuzzy_limit` best are shown,
+    best first. `match_mode="regex"` reads the search as a regular expression
+
+    Lists of `background_threshold` options or more are searched in a worker
+    thread, `search_chunk_size` options at a time, so typing never waits
+    for a search. The matches show up as they are found and a search that
+    is still running is dropped as soon as the search changes again
+
+    The results of the last `query_cache_size` searches are kept until
+    the options change, so going back to a search is instant
+    """
+
     def __init__(
         self,
         name: str | None = None,
@@ -21,6 +46,12 @@ class SearchList(SingleLevelTreeEdit):
         pad: bool = True,
         rotate: bool = False,
         wrap: bool = True,
+        ngram_index: bool = False,
+        match_mode: Literal["substring", "fuzzy", "regex"] = "substring",
+        fuzzy_limit: int = 100,
+        background_threshold: int = 50_000,
+        search_chunk_size: int = 10_000,
+        query_cache_size: int = 32,
     ) -> None:
         super().__init__(
             name,
@@ -40,9 +71,410 @@ class SearchList(SingleLevelTreeEdit):
                 style="dim white",
             )
         )
+        # every option, self.options only holds the ones matching the search
         self.option_copy = self.options[:]
         self.search_box.view = View(0, 100)
         self.search_mode = False
+        self.match_mode = match_mode
+        self.fuzzy_limit = fuzzy_limit
+        self.background_threshold = background_threshold
+        self.search_chunk_size = search_chunk_size
+        self._search_task: asyncio.Task | None = None
+
+        # the search self.options was narrowed down for
+        self._query = ""
+        self._options_version = 0
+        self._filtered_state = self._options_state()
+
+        # option id -> words of 3 letters, built on the first long search,
+        # in a worker thread once the widget is running
+        self._ngrams = NgramIndex() if ngram_index else None
+        self._positions: dict[int, int] = {}
+        self._positions_state: tuple[int, int, str] | None = None
+        # (options state, edits) -> the worker building both of them
+        self._index_build: tuple[tuple, asyncio.Future] | None = None
+
+        # every option holding the fuzzy search, not only the best ones
+        self._fuzzy_matches: list[SimpleInput] = []
+
+        # option id -> (value, spans of the search in it) for the search
+        # the options were filtered with, filled as the rows are drawn
+        self._match_spans: dict[int, tuple[str, list[tuple[int, int]]]] = {}
+        self._matcher: FuzzyMatcher | re.Pattern | str | None = None
+
+        # search -> (shown, fuzzy matches, spans, matcher) with the options
+        # stored as their positions in option_copy, dropped when an option
+        # is added, removed or edited
+        self.query_cache_size = query_cache_size
+        self._query_cache: OrderedDict[str, tuple] = OrderedDict()
+        self._query_cache_state: tuple | None = None
+        self._edits = 0
+
+    def _options_state(self) -> tuple[int, int, str]:
+        return self._options_version, len(self.option_copy), self.match_mode
+
+    def _filter(self) -> None:
+        """
+        Narrows the options down to the ones containing the search, it only
+        runs when the search changed and when the search grew only the
+        previous matches are looked at again
+        """
+
+        # The results of a search in the background are still coming in
+        if self._search_task is not None:
+            return
+
+        search = self.search_box.value
+        state = self._options_state()
+
+        if state == self._filtered_state and search == self._query:
+            return
+
+        if self._restore_cached(search):
+            self._query = search
+            self._filtered_state = state
+            return
+
+        narrowing = state == self._filtered_state and search.startswith(self._query)
+        candidates = self._candidates(search, narrowing)
+        matcher = self._matcher = self._matcher_for(search)
+
+        self._match_spans = {}
+        match matcher:
+            case None:
+                self.options = []
+            case _ if not search:
+                self.options = self.option_copy.copy()
+                self._fuzzy_matches = self.options
+            case FuzzyMatcher():
+                self._fuzzy_matches = [
+                    i for i in candidates if matcher.matches(i.value)
+                ]
+                best = matcher.top(
+                    ((option, option.value) for option in self._fuzzy_matches),
+                    self.fuzzy_limit,
+                )
+                self.options = [option for option, _ in best]
+                for option, positions in best:
+                    spans = _join_positions(positions)
+                    self._match_spans[id(option)] = (option.value, spans)
+            case re.Pattern():
+                self.options = [i for i in candidates if matcher.search(i.value)]
+            case _:
+                self.options = [i for i in candidates if search in i.value]
+
+        self._query = search
+        self._filtered_state = state
+        self._remember(search)
+
+    def _cached(self, search: str) -> tuple | None:
+        """
+        The cached results of search if they still hold
+        """
+
+        state = (*self._options_state(), self._edits)
+        if state != self._query_cache_state:
+            self._query_cache.clear()
+            self._query_cache_state = state
+
+        if (entry := self._query_cache.get(search)) is not None:
+            self._query_cache.move_to_end(search)
+
+        return entry
+
+    def _restore_cached(self, search: str) -> bool:
+        """
+        Shows the cached results of search, returns whether there were any
+        """
+
+        if (entry := self._cached(search)) is None:
+            return False
+
+        shown, matches, self._match_spans, self._matcher = entry
+        self.options = [self.option_copy[position] for position in shown]
+        self._fuzzy_matches = [self.option_copy[position] for position in matches]
+        return True
+
+    def _remember(self, search: str) -> None:
+        """
+        Caches the results of search, everything matches an empty search
+        so that is not worth keeping
+        """
+
+        if not search or not self.query_cache_size:
+            return
+
+        self._cached(search)
+        positions = self._option_positions()
+        matches = self._fuzzy_matches if self.match_mode == "fuzzy" else ()
+        self._query_cache[search] = (
+            array("I", [positions[id(option)] for option in self.options]),
+            array("I", [positions[id(option)] for option in matches]),
+            self._match_spans,
+            self._matcher,
+        )
+
+        while len(self._query_cache) > self.query_cache_size:
+            self._query_cache.popitem(last=False)
+
+    def _update_search(self) -> None:
+        """
+        Filters the options for a changed search, in the background
+        when there are too many to go through before the next key
+        """
+
+        self._cancel_search()
+        search = self.search_box.value
+        if (
+            self.is_running
+            and (
+                len(self.option_copy) >= self.background_threshold
+                or self._ngrams_stale(search)
+            )
+            and self._cached(search) is None
+        ):
+            self._search_task = asyncio.create_task(self._search_in_background())
+        else:
+            self._filter()
+            self.highlighted = 0 if self.options else None
+
+    def _cancel_search(self) -> None:
+        if self._search_task is not None:
+            self._search_task.cancel()
+            self._search_task = None
+
+    async def _search_in_background(self) -> None:
+        search = self.search_box.value
+        await self._build_indexes_in_background(search)
+
+        state = self._options_state()
+        narrowing = state == self._filtered_state and search.startswith(self._query)
+        candidates = self._candidates(search, narrowing)
+        matcher = self._matcher = self._matcher_for(search)
+        loop = asyncio.get_running_loop()
+
+        # Until this search is done the options match no finished search
+        self._filtered_state = None
+        self._match_spans = {}
+        self.options = matches = []
+        best: list[tuple] = []
+
+        try:
+            if matcher is not None:
+                for start in range(0, len(candidates), self.search_chunk_size):
+                    chunk = candidates[start : start + self.search_chunk_size]
+                    found = await loop.run_in_executor(
+                        None,
+                        _match_chunk,
+                        matcher,
+                        [option.value for option in chunk],
+                        start,
+                    )
+
+                    if isinstance(matcher, FuzzyMatcher):
+                        matches += [candidates[entry[3]] for entry in found]
+                        best = best_ranked(self.fuzzy_limit, best + found)
+                        self.options = [candidates[entry[3]] for entry in best]
+
+                        # rank() already found where the letters are
+                        for entry in best:
+                            option = candidates[entry[3]]
+                            if id(option) not in self._match_spans:
+                                spans = _join_positions(entry[4])
+                                self._match_spans[id(option)] = (option.value, spans)
+                    else:
+                        matches += [candidates[index] for index in found]
+
+                    self.highlighted = 0 if self.options else None
+                    self.refresh()
+
+            # No chunk ran when nothing could match
+            self.highlighted = 0 if self.options else None
+            self.refresh()
+
+            self._fuzzy_matches = matches
+            self._query = search
+            self._filtered_state = state
+            self._remember(search)
+        finally:
+            if self._search_task is asyncio.current_task():
+                self._search_task = None
+
+    def _ngrams_stale(self, search: str) -> bool:
+        """
+        Whether search needs the n-gram index built before it can be used
+        """
+
+        return (
+            self._ngrams is not None
+            and len(search) >= self._ngrams.n
+            and len(self._ngrams) != len(self.option_copy)
+        )
+
+    async def _build_indexes_in_background(self, search: str) -> None:
+        """
+        Builds the position map and the n-gram index search needs in a
+        worker thread, searches started meanwhile wait for the same build
+        """
+
+        loop = asyncio.get_running_loop()
+        while True:
+            state = (*self._options_state(), self._edits)
+            positions_stale = self._positions_state != state[:3]
+            ngrams_stale = self._ngrams_stale(search)
+            if not (positions_stale or ngrams_stale):
+                return
+
+            if self._index_build is None or self._index_build[0] != state:
+                # The values are read here, reading a value caches its text
+                # so it must not happen in the worker while it is edited
+                future = loop.run_in_executor(
+                    None,
+                    _build_indexes,
+                    [(id(option), option.value) for option in self.option_copy],
+                    self._ngrams.n if ngrams_stale else None,
+                )
+                self._index_build = (state, future)
+
+            future = self._index_build[1]
+            # Cancelling this search must not throw the build away
+            positions, ngrams = await asyncio.shield(future)
+            if self._index_build is not None and self._index_build[1] is future:
+                self._index_build = None
+
+            # The options changed while it was being built, build again
+            if (*self._options_state(), self._edits) != state:
+                continue
+
+            if self._positions_state != state[:3]:
+                self._positions = positions
+                self._positions_state = state[:3]
+            if ngrams is not None and self._ngrams_stale(search):
+                self._ngrams = ngrams
+
+    def _candidates(self, search: str, narrowing: bool) -> list[SimpleInput]:
+        """
+        The options that can still match the search
+        """
+
+        match self.match_mode:
+            case "fuzzy":
+                if narrowing and self._query:
+                    return self._fuzzy_matches
+            case "regex":
+                # A longer pattern can match more, so it always starts over
+                pass
+            case _:
+                # Matches of a search the index could answer are already few
+                if not (
+                    narrowing
+                    and self._ngrams is not None
+                    and len(self._query) >= self._ngrams.n
+                ):
+                    if (indexed := self._ngram_candidates(search)) is not None:
+                        return indexed
+
+                if narrowing:
+                    return self.options
+
+        return self.option_copy
+
+    def _matcher_for(self, search: str) -> FuzzyMatcher | re.Pattern | str | None:
+        """
+        What the options are matched with, None for a broken regex
+        """
+
+        match self.match_mode:
+            case "fuzzy":
+                return FuzzyMatcher(search)
+            case "regex":
+                try:
+                    return re.compile(search)
+                except re.error:
+                    return None
+            case _:
+                return search
+
+    def _ngram_candidates(self, search: str) -> list[SimpleInput] | None:
+        """
+        The options that may contain search in the order of the full list,
+        None when there is no index or it would not narrow the search much
+        """
+
+        if self._ngrams is None or len(search) < self._ngrams.n:
+            return None
+
+        if len(self._ngrams) != len(self.option_copy):
+            self._ngrams.clear()
+            for option in self.option_copy:
+                self._ngrams.add(id(option), option.value)
+
+        # Past that walking the whole list is cheaper than sorting the rows
+        keys = self._ngrams.candidates(search, limit=len(self.option_copy) // 8)
+        if keys is None:
+            return None
+
+        positions = self._option_positions()
+        return [
+            self.option_copy[position]
+            for position in sorted(positions[key] for key in keys)
+        ]
+
+    def _option_positions(self) -> dict[int, int]:
+        """
+        Option id -> position in option_copy
+        """
+
+        state = self._options_state()
+        if state != self._positions_state:
+            self._positions = {
+                id(option): position for position, option in enumerate(self.option_copy)
+            }
+            self._positions_state = state
+
+        return self._positions
+
+    def _option_edited(self, option: SimpleInput, old_value: str) -> None:
+        if option.value == old_value:
+            return
+
+        self._edits += 1
+        if self._ngrams is not None and id(option) in self._ngrams:
+            self._ngrams.update(id(option), option.value)
+
+    def _insert_option(self, index: int) -> None:
+        # The options are still being set up, the copy is made afterwards
+        if not hasattr(self, "option_copy"):
+            return super()._insert_option(index)
+
+        # Keep the new option next to its neighbour in the full list too
+        if not self._query:
+            position = index
+        elif index < len(self.options):
+            position = self.option_copy.index(self.options[index])
+        elif self.options:
+            position = self.option_copy.index(self.options[-1]) + 1
+        else:
+            position = len(self.option_copy)
+
+        super()._insert_option(index)
+        option = self.options[index]
+        self.option_copy.insert(position, option)
+        if self._ngrams is not None:
+            self._ngrams.add(id(option), option.value)
+
+        self._options_version += 1
+        self._filtered_state = self._options_state()
+
+    def remove_option(self, index: int | None = None) -> None:
+        option = self.options[self.highlighted]
+        super().remove_option(index)
+        self.option_copy.remove(option)
+        if self._ngrams is not None:
+            self._ngrams.remove(id(option))
+
+        self._options_version += 1
+        self._filtered_state = self._options_state()
 
     def start_search(self) -> None:
         """
@@ -51,8 +483,6 @@ class SearchList(SingleLevelTreeEdit):
 
         self.search_mode = True
         self.search_box.on_focus()
-        if not self.search_box.value:
-            self.option_copy = self.options[:]
 
     def stop_search(self) -> None:
         """
@@ -62,17 +492,16 @@ class SearchList(SingleLevelTreeEdit):
         self.search_mode = False
         self.search_box.on_blur()
 
-        self.options = self.option_copy.copy()
-
     async def clear_search_box(self) -> None:
         await self.search_box.on_key(events.Key(self, "ctrl+l"))
+        self._cancel_search()
 
         if self.option_copy:
             self.highlighted = 0
         else:
             self.highlighted = None
 
-        self.options = self.option_copy.copy()
+        self._filter()
 
     async def on_key(self, event: events.Key) -> None:
 
@@ -81,12 +510,11 @@ class SearchList(SingleLevelTreeEdit):
                 self.stop_search()
             else:
                 await self.search_box.on_key(event)
-                if self.search_box.value:
-                    search = self.search_box.value
-                    if [i for i in self.option_copy[:] if search in i.value]:
-                        self.highlighted = 0
-                    else:
-                        self.highlighted = None
+                # Keys that arrived together are searched for once, at the last
+                if self.batch_keys and key_pending(self):
+                    pass
+                elif self.search_box.value:
+                    self._update_search()
                 else:
                     await self.clear_search_box()
 
@@ -98,7 +526,10 @@ class SearchList(SingleLevelTreeEdit):
                     await self.clear_search_box()
                 case _:
                     if self.highlighted is not None:
-                        await self.options[self.highlighted].on_key(event)
+                        option = self.options[self.highlighted]
+                        old_value = option.value
+                        await option.on_key(event)
+                        self._option_edited(option, old_value)
 
         else:
 
@@ -135,17 +566,17 @@ class SearchList(SingleLevelTreeEdit):
                                     )
                                 )
 
-        self.refresh()
+        if not (self.batch_keys and key_pending(self)):
+            self.refresh()
 
     def render_tree(self) -> RenderableType:
         tree = Tree("")
         tree.hide_root = True
         tree.expanded = True
         width = self.size.width - 4
-        search = self.search_box.value
 
         tree.add(self.search_box.render())
-        self.options = [i for i in self.option_copy[:] if search in i.value]
+        self._filter()
 
         for index, option in enumerate(self.options):
 
@@ -168,7 +599,130 @@ class SearchList(SingleLevelTreeEdit):
             else:
                 label.stylize(self.style_unfocused)
 
-            label.highlight_regex(search, style=self.style_search_match)
+            for start, end in self._display_spans(option, self._spans(option)):
+                label.stylize(self.style_search_match, start, end)
+
             tree.add(label)
 
+        self._rendered_count = len(self.options)
         return tree
+
+    def _spans(self, option: SimpleInput) -> list[tuple[int, int]]:
+        """
+        Where the search matched in the value of an option, worked out once
+        per search unless the option is edited
+        """
+
+        # The matcher belongs to the search the options are being filtered
+        # with, which is ahead of self._query while a search is running
+        matcher = self._matcher
+        if matcher is None or matcher == "":
+            return []
+
+        value = option.value
+        cached = self._match_spans.get(id(option))
+        if cached and cached[0] == value:
+            return cached[1]
+
+        spans = []
+        match matcher:
+            case FuzzyMatcher():
+                if result := matcher.match(value):
+                    spans = _join_positions(result[1])
+            case re.Pattern():
+                spans = [
+                    found.span()
+                    for found in matcher.finditer(value)
+                    if found.end() > found.start()
+                ]
+            case _:
+                start = value.find(matcher)
+                while start != -1:
+                    spans.append((start, start + len(matcher)))
+                    start = value.find(matcher, start + len(matcher))
+
+        self._match_spans[id(option)] = (value, spans)
+        return spans
+
+    def _display_spans(
+        self, option: SimpleInput, spans: list[tuple[int, int]]
+    ) -> list[tuple[int, int]]:
+        """
+        Maps spans in the value of an option to where they are shown in its
+        row, cut to the part that is scrolled into view
+        """
+
+        # The cursor is drawn inside the text of the option being edited
+        cursor = option._cursor_position if option.has_focus else None
+        shift = len(option.cursor)
+        view = option.view
+
+        pieces = []
+        for start, end in spans:
+            if cursor is not None and start < cursor < end:
+                pieces += [(start, cursor), (cursor + shift, end + shift)]
+            elif cursor is not None and start >= cursor:
+                pieces.append((start + shift, end + shift))
+            else:
+                pieces.append((start, end))
+
+        # 1 space of padding before the option
+        return [
+            (
+                max(start, view.start) - view.start + 1,
+                min(end, view.end) - view.start + 1,
+            )
+            for start, end in pieces
+            if start < view.end and end > view.start
+        ]
+
+
+def _match_chunk(
+    matcher: FuzzyMatcher | re.Pattern | str, values: list[str], start: int
+) -> list:
+    """
+    Matches a chunk of option values in a worker thread, returns the ranked
+    entries for a FuzzyMatcher and the indexes of the matches otherwise
+    """
+
+    if isinstance(matcher, FuzzyMatcher):
+        return list(matcher.rank(values, start))
+
+    if isinstance(matcher, re.Pattern):
+        return [start + i for i, value in enumerate(values) if matcher.search(value)]
+
+    return [start + i for i, value in enumerate(values) if matcher in value]
+
+
+def _build_indexes(
+    options: list[tuple[int, str]], n: int | None
+) -> tuple[dict[int, int], NgramIndex | None]:
+    """
+    Builds the position map and, for an n, the n-gram index of the
+    (option id, value) pairs in a worker thread
+    """
+
+    positions = {key: position for position, (key, _) in enumerate(options)}
+    if n is None:
+        return positions, None
+
+    ngrams = NgramIndex(n)
+    for key, value in options:
+        ngrams.add(key, value)
+
+    return positions, ngrams
+
+
+def _join_positions(positions: list[int]) -> list[tuple[int, int]]:
+    """
+    Turns matched positions into spans, neighbours become one span
+    """
+
+    spans: list[tuple[int, int]] = []
+    for position in positions:
+        if spans and spans[-1][1] == position:
+            spans[-1] = (spans[-1][0], position + 1)
+        else:
+            spans.append((position, position + 1))
+
+    return spans
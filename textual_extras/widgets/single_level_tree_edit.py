@@ -26,6 +26,8 @@ class SingleLevelTreeEdit(Widget):
     An editable tree structure with no nests
     """
 
+    batch_keys: bool = True
+
     def __init__(
         self,
         name: str | None = None,
@@ -47,6 +49,13 @@ class SingleLevelTreeEdit(Widget):
         self.editing = False
         self.options_temp = options
         self.setup_done = False
+
+        # index -> (rendered option, is highlighted, is editing, finished row)
+        self._rows: dict[int, tuple[RenderableType, bool, bool, Text]] = {}
+        self._rows_key: tuple | None = None
+        self._rendered_count = 0
+
+        self.highlighted = -1
         self.highlight(-1)
         self._setup_preoptions()
 
@@ -63,13 +72,29 @@ class SingleLevelTreeEdit(Widget):
             self.unfocus_option()
 
     def highlight(self, index: int) -> None:
+        prev = self.highlighted
         self.highlighted = max(-1, index)
         if self.highlighted != -1:
             self.current_opt = self.options[self.highlighted]
         else:
             self.current_opt = None
 
-        self.refresh()
+        self._refresh_rows(prev, self.highlighted)
+
+    def _refresh_rows(self, *indexes: int) -> None:
+        """
+        Repaints the widget with only the given rows built again,
+        the layout is redone only when the number of options has changed
+        """
+
+        for index in indexes:
+            self._rows.pop(index, None)
+
+        # Counted here too, subclasses like SearchList draw their own rows
+        count = len(self.options) if hasattr(self, "options") else 0
+        layout = count != self._rendered_count
+        self._rendered_count = count
+        self.refresh(layout=layout)
 
     def cursor_down(self) -> None:
         """
@@ -114,20 +139,27 @@ class SingleLevelTreeEdit(Widget):
         self.options.pop(self.highlighted)
         self.cursor_up()
 
+    def _insert_option(self, index: int) -> None:
+        """
+        Puts a new empty option at index
+        """
+
+        self.options.insert(index, SimpleInput())
+
     def add_option_below(self, move_cursor: bool = True) -> None:
-        self.options.insert(self.highlighted + 1, SimpleInput())
+        self._insert_option(self.highlighted + 1)
         if move_cursor:
             self.cursor_down()
             self.focus_option()
 
     def add_option_at_end(self, edit: bool = True) -> None:
-        self.options.insert(len(self.options), SimpleInput())
+        self._insert_option(len(self.options))
         if edit:
             self.move_to_bottom()
             self.focus_option()
 
     def add_option(self, index: int, edit: bool = True) -> None:
-        self.options.insert(index, SimpleInput())
+        self._insert_option(index)
         if edit:
             self.highlight(index)
             self.focus_option()
@@ -156,7 +188,7 @@ class SingleLevelTreeEdit(Widget):
         if self.wrap:
             label = label[: self.size.width - 4]
 
-        if is_highlighted == self.highlighted:
+        if is_highlighted:
             if self.editing:
                 label.stylize(self.style_editing)
             else:
@@ -176,17 +208,37 @@ class SingleLevelTreeEdit(Widget):
         tree.expanded = True
         width = self.size.width - 4
 
+        # Rows are only built again when their option or highlight changes
+        key = (
+            width,
+            self.wrap,
+            self.style_focused,
+            self.style_unfocused,
+            self.style_editing,
+        )
+        if key != self._rows_key:
+            self._rows_key = key
+            self._rows.clear()
+
+        cache: dict[int, tuple[RenderableType, bool, bool, Text]] = {}
         for index, option in enumerate(self.options):
 
             if not hasattr(option, "view"):
                 option.view = View(0, width - 1)
 
             label = option.render()
-            label = self.render_custom_label(
-                label,
-                index == self.highlighted,
-            )
+            is_highlighted = index == self.highlighted
+            state = (is_highlighted, is_highlighted and self.editing)
+
+            cached = self._rows.get(index)
+            if cached and cached[0] is label and cached[1:3] == state:
+                row = cached[3]
+            else:
+                row = self.render_custom_label(label, is_highlighted)
 
-            tree.add(label)
+            cache[index] = (label, *state, row)
+            tree.add(row)
 
+        self._rows = cache
+        self._rendered_count = len(self.options)
         return tree
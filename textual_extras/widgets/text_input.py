@@ -1,5 +1,7 @@
-import pyperclip
-from typing import Literal
+import asyncio
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator, Literal
 
 from rich.box import SQUARE, Box
 from rich.align import AlignMethod
@@ -9,10 +11,20 @@ from rich.text import Text, TextType
 from rich.console import RenderableType
 
 from textual import events
+from textual._timer import Timer
 from textual.reactive import Reactive
 from textual.widget import Widget
 
 from ..events import TextChanged, PyperclipError, InvalidInputAttempt
+from ..utils import (
+    Clipboard,
+    EditJournal,
+    GapBuffer,
+    InputValidator,
+    SystemClipboard,
+    WordIndex,
+    key_pending,
+)
 
 
 class View:
@@ -51,8 +63,8 @@ class TextInput(Widget):
     A simple single line Text Input widget
     """
 
-    value: str = ""
     cursor: str = "|"
+    batch_keys: bool = True
     _cursor_position: int = 0
     _has_focus: Reactive[bool] = Reactive(False)
 
@@ -66,7 +78,26 @@ class TextInput(Widget):
         placeholder: TextType = Text("Placeholder ...", style="dim white"),
         password: bool = False,
         list: tuple[Literal["blacklist", "whitelist"], list[str]] = ("blacklist", []),
+        max_length: int | None = None,
+        pattern: str | None = None,
+        delimiters: str = " ",
+        change_delay: float = 0,
+        change_mode: Literal["debounce", "throttle"] = "debounce",
+        history_bytes: int = 1 << 20,
+        clipboard: Clipboard = SystemClipboard(),
+        paste_timeout: float = 5,
     ) -> None:
+        self._buffer = GapBuffer()
+        self._words = WordIndex(self._buffer, delimiters)
+        self._journal = EditJournal(history_bytes)
+        self._rendered: tuple[tuple, RenderableType] | None = None
+        self._transaction_depth = 0
+        self._transaction_version = 0
+        self._change_timer: Timer | None = None
+        self._change_generation = 0
+        self._burst_version: int | None = None
+        self._paste_task: asyncio.Task | None = None
+        self.pasting = False
         super().__init__(name)
         self.title = title
         self.title_align: AlignMethod = title_align  # Silence compiler warning
@@ -74,27 +105,48 @@ class TextInput(Widget):
         self.placeholder = placeholder
         self.password = password
         self.list = list
+        self.validator = InputValidator(list, max_length, pattern)
         self.box = box
+        self.change_delay = change_delay
+        self.change_mode = change_mode
+        self.clipboard = clipboard
+        self.paste_timeout = paste_timeout
 
-        self._cursor_position = len(self.value)
+        self._cursor_position = len(self._buffer)
         self.width = self.size.width - 4
 
     @property
     def has_focus(self) -> bool:
         return self._has_focus
 
+    @property
+    def value(self) -> str:
+        """
+        The text in the Input Box, built lazily from the buffer
+        """
+
+        return self._buffer.text
+
+    @value.setter
+    def value(self, value: str) -> None:
+        self._buffer.set(value)
+        self._journal.clear()
+
+    @property
+    def valid(self) -> bool:
+        """
+        Whether the whole value matches the pattern, the pattern describes
+        a finished value so it never refuses input, it is only reported here
+        """
+
+        return self.validator.matches(self.value)
+
     async def on_resize(self, _: events.Resize) -> None:
         self._set_view()
         self.update_view(self._cursor_position, 0)
         self._cursor_position = 0
         self.refresh()
 
-    def _format_text(self, text: str) -> str:
-        """
-        Trims the non-visible part of the widget
-        """
-        return text[self.view.start : self.view.end]
-
     def _set_view(self):
         if self.box:
             self.width = self.size.width - 4
@@ -104,23 +156,50 @@ class TextInput(Widget):
         self.width = self.size.width - 4
         self.view = View(0, self.width)
 
+    def _render_key(self) -> tuple:
+        """
+        Everything the rendered output depends on
+        """
+
+        return (
+            self._buffer.version,
+            self._cursor_position,
+            self.view.start,
+            self.view.end,
+            self.has_focus,
+            self.pasting,
+            self.size,
+            self.password,
+            self.cursor,
+            self.box,
+            self.title,
+            self.title_align,
+            self.border_style,
+            self.placeholder,
+        )
+
     def render(self) -> RenderableType:
         """
         Renders a Panel for the Text Input Box
+        Reuses the last render if nothing has changed since
         """
 
         if not hasattr(self, "view"):
             self._set_view()
 
-        if self.has_focus:
-            text = self._render_text_with_cursor()
-        else:
-            if len(self.value) == 0:
-                return self.render_panel(self.placeholder)
-            else:
-                text = self.value
+        key = self._render_key()
+        if self._rendered is not None and self._rendered[0] == key:
+            return self._rendered[1]
+
+        renderable = self._render()
+        self._rendered = (key, renderable)
+        return renderable
 
-        formatted_text = Text.from_markup(self._format_text(text))
+    def _render(self) -> RenderableType:
+        if not self.has_focus and len(self._buffer) == 0:
+            return self.render_panel(self.placeholder)
+
+        formatted_text = Text.from_markup(self._visible_text())
         return self.render_panel(formatted_text)
 
     def render_panel(self, text: TextType) -> RenderableType:
@@ -141,21 +220,39 @@ class TextInput(Widget):
         else:
             return text
 
-    def _render_text_with_cursor(self) -> str:
+    def _visible_slice(self, start: int, end: int) -> str:
         """
-        Produces renderable Text object combining value and cursor
+        Produces the text between start and end, masked in password mode
         """
 
-        text = ""
-
         if self.password:
-            text += "•" * self._cursor_position
-            text += self.cursor
-            text += "•" * (len(self.value) - self._cursor_position)
-        else:
-            text += self.value[: self._cursor_position]
-            text += self.cursor
-            text += self.value[self._cursor_position :]
+            return "•" * max(min(end, len(self._buffer)) - max(start, 0), 0)
+
+        return self._buffer.slice(start, end)
+
+    def _visible_text(self) -> str:
+        """
+        Produces only the visible part of the text combined with the cursor,
+        so the work done depends on the width of the view and not the value
+        """
+
+        start, end = self.view.start, self.view.end
+        if not self.has_focus:
+            return self._visible_slice(start, end)
+
+        # The view is measured over the text with the cursor inserted in it
+        cursor = "…" * len(self.cursor) if self.pasting else self.cursor
+        cursor_start = self._cursor_position
+        cursor_end = cursor_start + len(cursor)
+
+        text = self._visible_slice(start, min(end, cursor_start))
+        if start < cursor_end and end > cursor_start:
+            text += cursor[max(start - cursor_start, 0) : end - cursor_start]
+
+        text += self._visible_slice(
+            max(start, cursor_end) - len(self.cursor),
+            end - len(self.cursor),
+        )
 
         return text
 
@@ -169,52 +266,297 @@ class TextInput(Widget):
         """
         Clears the Input Box
         """
-        self.value = ""
-        self._cursor_position = 0
+        self._replace_range(0, len(self._buffer), "")
         self.refresh()
 
-    def _is_allowed(self, text: str) -> bool:
-        if self.list[0] == "whitelist":
-            for letter in text:
-                if letter not in self.list[1]:
-                    return False
+    def _find_invalid(self, text: str) -> list[int] | None:
+        """
+        Validates text before it gets inserted at the cursor
+        Returns None if it is allowed, else the offending positions
+        """
+
+        if self.validator.rules is not self.list:
+            self.validator = InputValidator(
+                self.list,
+                self.validator.max_length,
+                self.validator.pattern,
+            )
+
+        if invalid := self.validator.find_invalid(text):
+            return invalid
+
+        if not self.validator.fits(len(self._buffer) + len(text)):
+            return []
+
+        return None
+
+    def _insert(self, pos: int, text: str) -> None:
+        """
+        Inserts text in the buffer and keeps the word index in sync
+        """
+
+        if text:
+            self._buffer.insert(pos, text)
+            self._words.update(pos, 0, len(text))
+
+    def _delete(self, start: int, end: int) -> None:
+        """
+        Deletes text from the buffer and keeps the word index in sync
+        """
+
+        if start < end:
+            self._buffer.delete(start, end)
+            self._words.update(start, end - start, 0)
+
+    def _replace_range(self, start: int, end: int, text: str) -> None:
+        """
+        Replaces the text between start and end and moves the cursor along
+        """
+
+        start = max(0, min(start, len(self._buffer)))
+        end = max(start, min(end, len(self._buffer)))
+
+        self._journal.record(start, self._buffer.slice(start, end), text)
+        self._delete(start, end)
+        self._insert(start, text)
+
+        if self._cursor_position >= end:
+            self._cursor_position += len(text) - (end - start)
+        elif self._cursor_position > start:
+            self._cursor_position = start + len(text)
+
+    def _scroll_to_cursor(self) -> None:
+        """
+        Shifts the view by the least amount that brings the cursor in it
+        """
+
+        if not hasattr(self, "view"):
+            return
+
+        if self._cursor_position < self.view.start:
+            self.view.shift_left(self.view.start - self._cursor_position)
+        elif self._cursor_position >= self.view.end:
+            self.view.shift_right(
+                self._cursor_position - self.view.end + 1,
+                len(self._buffer) + 1,
+            )
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["TextInput"]:
+        """
+        Groups any number of edits so that they cause a single view update,
+        a single TextChanged and a single refresh when the outermost one ends
+        """
+
+        if not self._transaction_depth:
+            self._transaction_version = self._buffer.version
+
+        self._transaction_depth += 1
+        self._journal.begin_group()
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+            self._journal.end_group()
+
+        if not self._transaction_depth:
+            self._scroll_to_cursor()
+            if self._buffer.version != self._transaction_version:
+                await self._text_changed()
+
+            self.refresh()
+
+    async def replace_range(self, start: int, end: int, text: str) -> None:
+        """
+        Replaces the text between start and end
+        """
+
+        async with self.transaction():
+            self._replace_range(start, end, text)
+
+    async def insert_at(self, pos: int, text: str) -> None:
+        """
+        Inserts text at the given position
+        """
+
+        async with self.transaction():
+            self._replace_range(pos, pos, text)
+
+    async def set_value(self, value: str) -> None:
+        """
+        Replaces the whole text and moves the cursor to the end of it
+        """
+
+        async with self.transaction():
+            self._replace_range(0, len(self._buffer), value)
+            self._cursor_position = len(self._buffer)
+
+    def _undo(self) -> None:
+        """
+        Reverts the latest step in the edit history
+        """
+
+        if (step := self._journal.undo()) is None:
+            return
+
+        self._journal.paused = True
+        try:
+            for edit in reversed(step):
+                end = edit.pos + len(edit.inserted)
+                self._replace_range(edit.pos, end, edit.deleted)
+                self._cursor_position = edit.pos + len(edit.deleted)
+        finally:
+            self._journal.paused = False
+
+    def _redo(self) -> None:
+        """
+        Applies the latest undone step again
+        """
+
+        if (step := self._journal.redo()) is None:
+            return
+
+        self._journal.paused = True
+        try:
+            for edit in step:
+                end = edit.pos + len(edit.deleted)
+                self._replace_range(edit.pos, end, edit.inserted)
+                self._cursor_position = edit.pos + len(edit.inserted)
+        finally:
+            self._journal.paused = False
+
+    async def undo(self) -> None:
+        """
+        Undoes the latest step of editing
+        """
+
+        async with self.transaction():
+            self._undo()
+
+    async def redo(self) -> None:
+        """
+        Redoes the latest undone step of editing
+        """
+
+        async with self.transaction():
+            self._redo()
+
+    async def paste(self) -> None:
+        """
+        Pastes the clipboard content where the cursor is
+        The clipboard is read in a worker thread so the event loop never waits
+        on it, the cursor shows "…" meanwhile
+        """
+
+        self.cancel_paste()
+
+        if self.is_running:
+            self._paste_task = asyncio.create_task(self._paste(report=True))
         else:
-            for letter in text:
-                if letter in self.list[1]:
-                    return False
+            # Not mounted (e.g. an option inside a list), the owner
+            # refreshes once the key is handled so wait for the text here
+            await self._paste(report=False)
 
-        return True
+    def cancel_paste(self) -> None:
+        """
+        Stops waiting for a paste that is in progress
+        """
+
+        if self._paste_task is not None:
+            self._paste_task.cancel()
+            self._paste_task = None
 
-    async def _insert_text(self, text: str | None = None) -> None:
+        if self.pasting:
+            self.pasting = False
+            self.refresh()
+
+    async def _paste(self, report: bool) -> None:
+        self.pasting = True
+        self.refresh()
+
+        try:
+            # A hung clipboard owner keeps its thread busy, but only until
+            # the timeout for us. The read is shielded so the next paste
+            # waits on it instead of starting another one
+            text = await asyncio.wait_for(
+                asyncio.shield(self.clipboard.read()),
+                self.paste_timeout,
+            )
+        except Exception:
+            await self.emit(PyperclipError(self))
+            return
+        finally:
+            # A cancelled paste must not reset a newer one
+            if self._paste_task in (None, asyncio.current_task()):
+                self._paste_task = None
+                self.pasting = False
+                self.refresh()
+
+        if report:
+            async with self.transaction():
+                await self._insert_text(text)
+        else:
+            await self._insert_text(text)
+
+    async def _insert_text(self, text: str) -> None:
         """
         Inserts text where the cursor is
         """
 
-        # Will throw an error if `xclip` if not installed on the linux(Xorg) system,
-        # should work just fine on windows and mac
+        if (invalid := self._find_invalid(text)) is not None:
+            await self.emit(InvalidInputAttempt(self, invalid))
+            return
+
+        self._replace_range(self._cursor_position, self._cursor_position, text)
 
-        if text is None:
-            text = pyperclip.paste()
+    async def _text_changed(self) -> None:
+        """
+        Emits TextChanged right away, or after `change_delay` seconds
+        In debounce mode the delay restarts with every change, in throttle
+        mode the changes during the delay are reported together at its end
+        """
 
-        if not self._is_allowed(text):
-            await self.emit(InvalidInputAttempt(self))
+        if not self.change_delay:
+            await self.emit(TextChanged(self))
             return
 
-        self.value = (
-            self.value[: self._cursor_position]
-            + text
-            + self.value[self._cursor_position :]
+        if self._change_timer is not None:
+            if self.change_mode == "throttle":
+                return
+
+            await self._change_timer.stop()
+
+        self._change_generation += 1
+        self._change_timer = self.set_timer(
+            self.change_delay,
+            partial(self._emit_delayed_change, self._change_generation),
         )
 
-        self._cursor_position += len(text)
+    async def _emit_delayed_change(self, generation: int) -> None:
+        # A timer that was replaced might still have posted its event
+        if generation != self._change_generation:
+            return
+
+        self._change_timer = None
+        await self.emit(TextChanged(self))
 
     async def on_key(self, event: events.Key) -> None:
         """Send the key to the Input"""
         prev = self._cursor_position
+        if self._burst_version is None:
+            self._burst_version = self._buffer.version
 
         await self.handle_keypress(event.key)
         self.update_view(prev, self._cursor_position)
-        await self.emit(TextChanged(self))
+
+        # Keys that arrived together are reported and painted together
+        if self.batch_keys and key_pending(self):
+            return
+
+        version, self._burst_version = self._burst_version, None
+        if self._buffer.version != version:
+            await self._text_changed()
+
         self.refresh()
 
     async def _move_cursor_backward(self, word=False, delete=False) -> None:
@@ -229,18 +571,10 @@ class TextInput(Widget):
         if not word:
             self._cursor_position = max(self._cursor_position - 1, 0)
         else:
-            while self._cursor_position:
-                if self.value[self._cursor_position - 1] != " " and (
-                    self._cursor_position == 1
-                    or self.value[self._cursor_position - 2] == " "
-                ):
-                    self._cursor_position -= 1
-                    break
-
-                self._cursor_position -= 1
+            self._cursor_position = self._words.previous_start(self._cursor_position)
 
         if delete:
-            self.value = self.value[: self._cursor_position] + self.value[prev:]
+            self._replace_range(self._cursor_position, prev, "")
 
     async def _move_cursor_forward(self, word=False, delete=False) -> None:
         """
@@ -252,25 +586,13 @@ class TextInput(Widget):
         prev = self._cursor_position
 
         if not word:
-            self._cursor_position = min(self._cursor_position + 1, len(self.value))
+            self._cursor_position = min(self._cursor_position + 1, len(self._buffer))
         else:
-
-            while self._cursor_position < len(self.value):
-                if (
-                    self._cursor_position != prev
-                    and self.value[self._cursor_position - 1] == " "
-                    and (
-                        self._cursor_position == len(self.value) - 1
-                        or self.value[self._cursor_position] != " "
-                    )
-                ):
-                    break
-
-                self._cursor_position += 1
+            self._cursor_position = self._words.next_start(self._cursor_position)
 
         if delete:
-            self.value = self.value[:prev] + self.value[self._cursor_position :]
-            self._cursor_position = prev  # Because the cursor never actually moved :)
+            # Moves the cursor back to prev, because it never actually moved :)
+            self._replace_range(prev, self._cursor_position, "")
 
     def update_view(self, prev: int, curr: int) -> None:
         """
@@ -281,12 +603,10 @@ class TextInput(Widget):
             self.view.shift_left(prev - curr)
 
         elif prev <= self.view.end and curr >= self.view.end:
-            self.view.shift_right(curr - prev, len(self.value) + 1)
+            self.view.shift_right(curr - prev, len(self._buffer) + 1)
 
     async def clear_input(self):
-        await self.handle_keypress("end")
-        while self.value:
-            await self.handle_keypress("ctrl+h")
+        self._replace_range(0, len(self._buffer), "")
 
     async def handle_keypress(self, key: str) -> None:
         """
@@ -323,20 +643,26 @@ class TextInput(Widget):
             case "ctrl+l":
                 await self.clear_input()
 
+            # HISTORY
+            case "ctrl+z":
+                self._undo()
+
+            case "ctrl+y":
+                self._redo()
+
             # EXTRAS
             case "home":
                 self._cursor_position = 0
 
             case "end":
-                self._cursor_position = len(self.value)
+                self._cursor_position = len(self._buffer)
 
             # COPY-PASTA
             case "ctrl+v":
-                try:
-                    await self._insert_text()
-                except:
-                    await self.emit(PyperclipError(self))
-                    return
+                await self.paste()
+
+            case "escape":
+                self.cancel_paste()
 
         if len(key) == 1:
             await self._insert_text(key)